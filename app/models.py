@@ -1,10 +1,19 @@
 from datetime import datetime
 from app import db, login_manager
+from flask import g
 from flask_login import UserMixin
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    # Per-request cache; db.session.get also hits the identity map first
+    uid = int(user_id)
+    cache = getattr(g, '_user_cache', None)
+    if cache is None:
+        cache = g._user_cache = {}
+    user = cache.get(uid)
+    if user is None:
+        user = cache[uid] = db.session.get(User, uid)
+    return user
 
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
@@ -22,7 +31,7 @@ class User(db.Model, UserMixin):
 
 class RiskSettings(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     max_drawdown_percent = db.Column(db.Float, default=10.0)
     position_size_percent = db.Column(db.Float, default=5.0)
     max_leverage = db.Column(db.Float, default=10.0)
@@ -31,6 +40,8 @@ class RiskSettings(db.Model):
     max_open_positions = db.Column(db.Integer, default=3)
 
 class AccountSnapshot(db.Model):
+    __table_args__ = (db.Index('ix_snap_user_ts', 'user_id', 'timestamp'),)
+    
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     equity = db.Column(db.Float, nullable=False)
@@ -41,7 +52,7 @@ class AccountSnapshot(db.Model):
 
 class UserPreferences(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     trading_enabled = db.Column(db.Boolean, default=True)
     pause_reason = db.Column(db.String(255))
     mt5_account = db.Column(db.String(50))
@@ -52,7 +63,7 @@ class UserPreferences(db.Model):
 
 class AuditLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     event_type = db.Column(db.String(50), nullable=False)
     event_data = db.Column(db.Text) # JSON
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
@@ -63,6 +74,6 @@ class Strategy(db.Model):
     type = db.Column(db.String(50), nullable=False)
     parameters = db.Column(db.Text, nullable=False) # JSON
     is_active = db.Column(db.Boolean, default=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
 
-    user = db.relationship('User', backref=db.backref('strategies', lazy=True))
+    user = db.relationship('User', backref=db.backref('strategies', lazy='selectin'))
@@ -0,0 +1,40 @@
+"""
+JSON RESPONSES
+- orjson-backed replacement for flask.jsonify
+- NumPy arrays/scalars serialize directly (OPT_SERIALIZE_NUMPY)
+- ETag / If-None-Match revalidation for polled endpoints
+"""
+import hashlib
+import orjson
+from flask import Response, request
+
+
+def dumps(obj) -> bytes:
+    """orjson encode with NumPy support"""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def body_etag(body: bytes) -> str:
+    """Short content hash used as a strong ETag"""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def ojson(obj, status: int = 200) -> Response:
+    """Serialize obj with orjson into an application/json Response"""
+    return Response(dumps(obj), status=status, mimetype='application/json')
+
+
+def etag_json(body: bytes, etag: str = None) -> Response:
+    """
+    Serve pre-encoded JSON with an ETag. Clients revalidate every time
+    (no-cache) and get an empty 304 when the body is unchanged.
+    """
+    resp = Response(body, mimetype='application/json')
+    resp.set_etag(etag or body_etag(body))
+    resp.cache_control.no_cache = True
+    return resp.make_conditional(request)
+
+
+def ojson_etag(obj) -> Response:
+    """ojson() with ETag revalidation"""
+    return etag_json(dumps(obj))
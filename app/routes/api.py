@@ -1,40 +1,81 @@
-from flask import Blueprint, jsonify, request
-import pandas as pd
-import numpy as np
-import MetaTrader5 as mt5
-import os
-from datetime import datetime, timedelta
-import json
-from threading import Thread
-from dataclasses import asdict
-from app.services.settings_store import _settings, _log_buffer, add_log
+from flask import Blueprint, Response, request
+from threading import Thread, Lock, Event
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from collections import OrderedDict
+from itertools import islice
+import time
+import orjson
+from app.routes._json import ojson, ojson_etag, etag_json, body_etag
+from app.services.symbol_meta import price_decimals, symbol_meta
+from app.services.settings_store import _settings, _log_buffer, add_log, coerce_settings
 
 api = Blueprint('api', __name__)
 
+# Serialized closed candles for /history, LRU-bounded across symbols/timeframes
+_HISTORY_CACHE_SIZE = 256
+_history_cache = OrderedDict()
+_history_lock = Lock()
+_HISTORY_KEYS = (b't', b'o', b'h', b'l', b'c')
+_EMPTY_HISTORY = b'{"t":[],"o":[],"h":[],"l":[],"c":[]}'
+
 # ========== CHART DATA ==========
 
 @api.route('/history/<symbol>/<timeframe>')
 def history(symbol, timeframe):
-    """Returns candle data for Lightweight Charts with proper formatting."""
+    """
+    Returns candle data for Lightweight Charts as columns
+    {t, o, h, l, c}; the front-end zips them into candle objects.
+    """
     try:
         from app.services.realtime_data import realtime_service
         
-        candles = realtime_service.get_historical_candles(symbol, timeframe, 2000)
+        bars = realtime_service.get_historical_arrays(symbol, timeframe, 2000)
         
         # Format with proper precision based on symbol
-        decimals = 2 if any(x in symbol.upper() for x in ['JPY', 'XAU', 'BTC', 'ETH']) else 5
+        decimals = price_decimals(symbol)
+        
+        times = bars['time']
+        if times.size == 0:
+            return Response(_EMPTY_HISTORY, mimetype='application/json')
+        
+        # Only the forming (last) candle changes between polls, so the closed
+        # candles are serialized once per window (first/last time and bar
+        # count, so a reload or backfill with the same last bar misses).
+        key = (symbol, timeframe, int(times[0]), int(times[-1]), times.size, decimals)
+        with _history_lock:
+            closed = _history_cache.get(key)
+            if closed is not None:
+                _history_cache.move_to_end(key)
+        if closed is None:
+            closed = _history_columns(bars, decimals, slice(None, -1))
+            with _history_lock:
+                _history_cache[key] = closed
+                if len(_history_cache) > _HISTORY_CACHE_SIZE:
+                    _history_cache.popitem(last=False)
         
-        data = [{
-            'time': c.time,
-            'open': round(c.open, decimals),
-            'high': round(c.high, decimals),
-            'low': round(c.low, decimals),
-            'close': round(c.close, decimals)
-        } for c in candles]
+        last = _history_columns(bars, decimals, slice(-1, None))
+        body = b'{' + b','.join(
+            b'"%s":[%s%s]' % (name, head, b',' + tail if head else tail)
+            for name, head, tail in zip(_HISTORY_KEYS, closed, last)
+        ) + b'}'
         
-        return jsonify(data)
+        return Response(body, mimetype='application/json')
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojson({'error': str(e)}, 500)
+
+def _history_columns(bars, decimals, sl):
+    """
+    Columnar /history payload pieces for a slice of the candle arrays:
+    the JSON array contents (without brackets) for t, o, h, l, c.
+    """
+    import numpy as np
+    
+    # One np.round over the stacked (4, n) OHLC block
+    ohlc = np.round(np.stack((
+        bars['open'][sl], bars['high'][sl], bars['low'][sl], bars['close'][sl]
+    )), decimals)
+    columns = (bars['time'][sl], *ohlc)
+    return tuple(orjson.dumps(col, option=orjson.OPT_SERIALIZE_NUMPY)[1:-1] for col in columns)
 
 @api.route('/tick/<symbol>')
 def get_tick(symbol):
@@ -43,16 +84,16 @@ def get_tick(symbol):
     
     tick = realtime_service.get_live_price(symbol)
     if tick:
-        decimals = 2 if any(x in symbol.upper() for x in ['JPY', 'XAU', 'BTC', 'ETH']) else 5
-        return jsonify({
+        decimals, pips, _ = symbol_meta(symbol)
+        return ojson({
             'symbol': tick.symbol,
             'bid': round(tick.bid, decimals),
             'ask': round(tick.ask, decimals),
             'last': round(tick.last, decimals),
-            'spread': round((tick.ask - tick.bid) * 10000, 1),  # in pips
+            'spread': round((tick.ask - tick.bid) * pips, 1),  # in pips
             'time': tick.time
         })
-    return jsonify({'error': 'No data'}), 404
+    return ojson({'error': 'No data'}, 404)
 
 # ========== QUANT SIGNALS ==========
 
@@ -61,16 +102,17 @@ def get_signal(symbol):
     """Get quant-generated signal for symbol"""
     from app.services.quant_engine import quant_engine
     from app.services.realtime_data import realtime_service
+    import pandas as pd
     
     try:
-        candles = realtime_service.get_historical_candles(symbol, 'H1', 300)
-        df = pd.DataFrame([asdict(c) for c in candles])
+        bars = realtime_service.get_historical_arrays(symbol, 'H1', 300)
+        df = pd.DataFrame(bars, copy=False)
         
         signal = quant_engine.generate_signal(df, symbol)
         
         if signal:
-            decimals = 2 if any(x in symbol.upper() for x in ['JPY', 'XAU', 'BTC', 'ETH']) else 5
-            return jsonify({
+            decimals = price_decimals(symbol)
+            return ojson({
                 'symbol': symbol,
                 'direction': signal.direction,
                 'confidence': round(signal.confidence * 100, 1),
@@ -84,41 +126,52 @@ def get_signal(symbol):
                 'reasoning': signal.reasoning
             })
         else:
-            return jsonify({'symbol': symbol, 'direction': 'NEUTRAL', 'message': 'No valid signal'})
+            return ojson({'symbol': symbol, 'direction': 'NEUTRAL', 'message': 'No valid signal'})
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojson({'error': str(e)}, 500)
 
 @api.route('/scan')
 def scan_all():
     """Scan all symbols for signals"""
-    from app.services.quant_engine import quant_engine
     from app.services.realtime_data import realtime_service
     
     symbols = realtime_service.symbols
-    signals = []
+    if not symbols:
+        return ojson({'signals': [], 'count': 0})
     
-    for symbol in symbols:
-        try:
-            candles = realtime_service.get_historical_candles(symbol, 'H1', 300)
-            df = pd.DataFrame([asdict(c) for c in candles])
-            signal = quant_engine.generate_signal(df, symbol)
-            
-            if signal and signal.direction != 'NEUTRAL':
-                decimals = 2 if symbol in ['XAUUSD', 'BTCUSD'] else 5
-                signals.append({
-                    'symbol': symbol,
-                    'direction': signal.direction,
-                    'confidence': round(signal.confidence * 100, 1),
-                    'entry_price': round(signal.entry_price, decimals),
-                    'stop_loss': round(signal.stop_loss, decimals),
-                    'take_profit_1': round(signal.take_profit_1, decimals),
-                    'risk_reward': round(signal.risk_reward, 2),
-                    'strategy': signal.strategy
-                })
-        except Exception as e:
-            continue
+    # Per-symbol fetch + analysis is independent, fan it out (map keeps symbol order)
+    with ThreadPoolExecutor(max_workers=min(16, len(symbols))) as executor:
+        results = executor.map(_scan_one, symbols)
+    signals = [s for s in results if s is not None]
     
-    return jsonify({'signals': signals, 'count': len(signals)})
+    return ojson({'signals': signals, 'count': len(signals)})
+
+def _scan_one(symbol):
+    """Analyze one symbol for /scan, returns a signal dict or None"""
+    from app.services.quant_engine import quant_engine
+    from app.services.realtime_data import realtime_service
+    import pandas as pd
+    
+    try:
+        bars = realtime_service.get_historical_arrays(symbol, 'H1', 300)
+        df = pd.DataFrame(bars, copy=False)
+        signal = quant_engine.generate_signal(df, symbol)
+        
+        if signal and signal.direction != 'NEUTRAL':
+            decimals = price_decimals(symbol)
+            return {
+                'symbol': symbol,
+                'direction': signal.direction,
+                'confidence': round(signal.confidence * 100, 1),
+                'entry_price': round(signal.entry_price, decimals),
+                'stop_loss': round(signal.stop_loss, decimals),
+                'take_profit_1': round(signal.take_profit_1, decimals),
+                'risk_reward': round(signal.risk_reward, 2),
+                'strategy': signal.strategy
+            }
+    except Exception:
+        pass
+    return None
 
 # ========== EXECUTION ==========
 
@@ -139,15 +192,15 @@ def place_order():
             take_profit=data['take_profit'],
             order_type=OrderType.MARKET_BUY if data['side'] == 'BUY' else OrderType.MARKET_SELL
         )
-        return jsonify({'status': 'success', 'order': order.to_dict()})
+        return ojson({'status': 'success', 'order': order.to_dict()})
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        return ojson({'status': 'error', 'message': str(e)}, 500)
 
 @api.route('/positions')
 def get_positions():
     """Get open positions"""
     from app.services.execution_engine import execution_engine
-    return jsonify({
+    return ojson({
         'positions': execution_engine.get_open_positions(),
         'count': len(execution_engine.positions)
     })
@@ -156,7 +209,7 @@ def get_positions():
 def get_trades():
     """Get trade history"""
     from app.services.execution_engine import execution_engine
-    return jsonify({
+    return ojson({
         'trades': execution_engine.get_trade_history(),
         'count': len(execution_engine.trade_history)
     })
@@ -173,7 +226,7 @@ def get_account():
     account = realtime_service.get_account_info()
     execution_summary = execution_engine.get_account_summary()
     
-    return jsonify({
+    return ojson({
         'balance': account['balance'],
         'equity': account['equity'],
         'free_margin': account['free_margin'],
@@ -187,39 +240,42 @@ def get_account():
     })
 
 # ========== BOT CONTROL ==========
-bot_thread = None
-bot_running = False
+_bot_thread = None
+_bot_stop = Event()
+_bot_lock = Lock()
+
+def _bot_alive():
+    return _bot_thread is not None and _bot_thread.is_alive()
 
 @api.route('/bot/start', methods=['POST'])
 def start_bot():
-    global bot_thread, bot_running
+    global _bot_thread
     from app.services.trading_loop import TradingLoop
     
-    if bot_running:
-        return jsonify({'status': 'already_running'})
-    
-    user_id = 1
-    loop = TradingLoop(user_id)
-    
-    def run_loop():
-        global bot_running
-        bot_running = True
-        loop.start(interval_seconds=30)
-    
-    bot_thread = Thread(target=run_loop, daemon=True)
-    bot_thread.start()
+    with _bot_lock:
+        if _bot_alive():
+            return ojson({'status': 'already_running'})
+        
+        user_id = 1
+        loop = TradingLoop(user_id)
+        
+        _bot_stop.clear()
+        _bot_thread = Thread(target=loop.run_until_stopped, args=(_bot_stop, 30), daemon=True)
+        _bot_thread.start()
     
-    return jsonify({'status': 'started'})
+    return ojson({'status': 'started'})
 
 @api.route('/bot/stop', methods=['POST'])
 def stop_bot():
-    global bot_running
-    bot_running = False
-    return jsonify({'status': 'stopped'})
+    with _bot_lock:
+        _bot_stop.set()
+        if _bot_alive():
+            _bot_thread.join(timeout=5)
+    return ojson({'status': 'stopped'})
 
 @api.route('/bot/status')
 def bot_status():
-    return jsonify({'running': bot_running})
+    return ojson({'running': _bot_alive()})
 
 # ========== BACKTEST ==========
 
@@ -229,14 +285,15 @@ def run_backtest():
     from app.services.backtest_engine import backtest_engine
     from app.services.quant_engine import quant_engine
     from app.services.realtime_data import realtime_service
+    import pandas as pd
     
     data = request.json
     symbol = data.get('symbol', 'EURUSD')
     timeframe = data.get('timeframe', 'H1')
     
     try:
-        candles = realtime_service.get_historical_candles(symbol, timeframe, 1000)
-        df = pd.DataFrame([asdict(c) for c in candles])
+        bars = realtime_service.get_historical_arrays(symbol, timeframe, 1000)
+        df = pd.DataFrame(bars, copy=False)
         
         def strategy(historical_df):
             signal = quant_engine.generate_signal(historical_df, symbol)
@@ -244,9 +301,9 @@ def run_backtest():
                 return (signal.direction, signal.entry_price, signal.stop_loss, signal.take_profit_2)
             return None
         
-        result = backtest_engine.run_backtest(df, strategy)
+        result = backtest_engine.run_backtest(df, strategy, symbol=symbol)
         
-        return jsonify({
+        return ojson({
             'total_trades': result.total_trades,
             'win_rate': round(result.win_rate, 1),
             'total_pnl': round(result.total_pnl, 2),
@@ -258,10 +315,38 @@ def run_backtest():
             'avg_loss': round(result.avg_loss, 2)
         })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojson({'error': str(e)}, 500)
 
 # ========== AUTO TRADER ==========
 
+# Shared pool for status probes, so a slow check never holds up the request thread
+_status_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='status')
+
+# AI status shared by /ai/status, /auto/status and /system/status for a short TTL
+_ai_status_cache = {'t': 0.0, 'v': None}
+_ai_status_lock = Lock()
+
+def _cached_ai_status(ttl: float = 2.0):
+    from app.services.ai_agent import ai_agent
+    with _ai_status_lock:
+        now = time.monotonic()
+        if _ai_status_cache['v'] is None or now - _ai_status_cache['t'] > ttl:
+            _ai_status_cache['v'] = ai_agent.get_status()
+            _ai_status_cache['t'] = now
+        return _ai_status_cache['v']
+
+# Readiness check in flight, shared by /auto/status polls until it finishes
+_readiness_fut = None
+_readiness_lock = Lock()
+
+def _readiness_future():
+    global _readiness_fut
+    from app.services.auto_trader import auto_trader
+    with _readiness_lock:
+        if _readiness_fut is None or _readiness_fut.done():
+            _readiness_fut = _status_pool.submit(auto_trader._validate_system_ready)
+        return _readiness_fut
+
 @api.route('/auto/start', methods=['POST'])
 def start_auto_trader():
     """Start automated trading - WITH VALIDATION"""
@@ -272,7 +357,7 @@ def start_auto_trader():
     # Pre-flight validation
     validation = auto_trader._validate_system_ready()
     if not validation['ready']:
-        return jsonify({
+        return ojson({
             'status': 'error',
             'message': validation['reason'],
             'ready': False
@@ -280,19 +365,19 @@ def start_auto_trader():
     
     try:
         auto_trader.start()
-        return jsonify({
+        return ojson({
             'status': 'started',
             'ready': True,
             'message': 'Auto-trading engaged successfully'
         })
     except RuntimeError as e:
-        return jsonify({
+        return ojson({
             'status': 'error',
             'message': str(e),
             'ready': False
         }), 400
     except Exception as e:
-        return jsonify({
+        return ojson({
             'status': 'error',
             'message': f'Failed to start: {str(e)}',
             'ready': False
@@ -303,19 +388,28 @@ def stop_auto_trader():
     """Stop automated trading"""
     from app.services.auto_trader import auto_trader
     auto_trader.stop()
-    return jsonify({'status': 'stopped'})
+    return ojson({'status': 'stopped'})
 
 @api.route('/auto/status')
 def auto_trader_status():
     """Get auto-trader status with system readiness"""
     from app.services.auto_trader import auto_trader
     from app.services.realtime_data import realtime_service
-    from app.services.ai_agent import ai_agent
     
-    validation = auto_trader._validate_system_ready()
-    ai_status = ai_agent.get_status()
+    # Readiness may try to auto-start Ollama (seconds); run both checks side by side
+    v_fut = _readiness_future()
+    a_fut = _status_pool.submit(_cached_ai_status)
+    try:
+        validation = v_fut.result(timeout=2)
+    except FuturesTimeout:
+        validation = {'ready': False, 'reason': 'System readiness check still in progress'}
+    try:
+        ai_status = a_fut.result(timeout=2)
+    except FuturesTimeout:
+        # Last known status (possibly stale) rather than a 500 while Ollama is slow
+        ai_status = _ai_status_cache['v'] or {'status': 'UNKNOWN'}
     
-    return jsonify({
+    return ojson({
         'running': auto_trader.running,
         'ready': validation['ready'],
         'ready_reason': validation['reason'],
@@ -328,7 +422,7 @@ def auto_trader_status():
 def get_symbols():
     """Get available trading symbols from MT5 Market Watch"""
     from app.services.realtime_data import realtime_service
-    return jsonify({
+    return ojson_etag({
         'symbols': realtime_service.symbols,
         'data_mode': realtime_service.data_mode,
         'connected': realtime_service.mt5_connected or realtime_service.bridge_connected
@@ -343,33 +437,35 @@ def inject_pattern():
     pattern = data.get('pattern')
     
     if not symbol or not pattern:
-        return jsonify({'error': 'Missing symbol or pattern'}), 400
+        return ojson({'error': 'Missing symbol or pattern'}, 400)
         
     realtime_service.inject_pattern(symbol, pattern)
-    return jsonify({'status': 'queued', 'message': f'Pattern {pattern} will load on next chart refresh for {symbol}'})
+    return ojson({'status': 'queued', 'message': f'Pattern {pattern} will load on next chart refresh for {symbol}'})
+
+# Static catalog, serialized once at import
+_STRATEGIES_BODY: bytes = orjson.dumps({'strategies': [
+    {'name': 'Cortex Trend Guard', 'status': 'ACTIVE', 'type': 'Trend Follower', 'description': 'Ensemble EMA + VWAP trend validation'},
+    {'name': 'Oversold Mean Revert', 'status': 'ACTIVE', 'type': 'Mean Reversion', 'description': 'RSI + Bollinger exhaustion capture'},
+    {'name': 'Llama Brain Validator', 'status': 'ACTIVE', 'type': 'AI Validation', 'description': 'Real-time LLM signal filtering'},
+    {'name': 'Volatility Breakout', 'status': 'STANDBY', 'type': 'Volatility', 'description': 'ATR expansion detection'},
+    {'name': 'ML Probability Shield', 'status': 'ACTIVE', 'type': 'ML Guard', 'description': 'Proprietary success probability filter'},
+    {'name': 'Fibonacci Retrace Alpha', 'status': 'ACTIVE', 'type': 'Structure', 'description': 'Capture 61.8% golden pocket pullbacks'},
+    {'name': 'MACD Divergence Hunter', 'status': 'ACTIVE', 'type': 'Momentum', 'description': 'Identify price vs momentum exhaustion'},
+    {'name': 'Smart Money Flow', 'status': 'STANDBY', 'type': 'Institutional', 'description': 'Detect large order block activity'},
+    {'name': 'Harmonic Bat Pattern', 'status': 'ACTIVE', 'type': 'Geometric', 'description': 'Advanced XABCD structure detection'},
+    {'name': 'EMA 200 Pullback', 'status': 'ACTIVE', 'type': 'Trend Follower', 'description': 'Institutional value area entry'},
+    {'name': 'Price Action Scalper', 'status': 'ACTIVE', 'type': 'Scalping', 'description': 'High-frequency candle formation analysis'},
+    {'name': 'Supply/Demand Zone', 'status': 'ACTIVE', 'type': 'Price Action', 'description': 'Market imbalance detection'},
+    {'name': 'Pivot Point Scanner', 'status': 'ACTIVE', 'type': 'Math', 'description': 'Daily/Weekly equilibrium levels'},
+    {'name': 'Gap Closure Alpha', 'status': 'ACTIVE', 'type': 'Anomaly', 'description': 'Opening gap filling logic'},
+    {'name': 'News Volatilty Filter', 'status': 'ACTIVE', 'type': 'Protection', 'description': 'High-impact economic event protection'}
+]})
+_STRATEGIES_ETAG = body_etag(_STRATEGIES_BODY)
 
 @api.route('/strategies')
 def get_strategies():
     """Returns dynamic strategy list based on active models"""
-    return jsonify({
-        'strategies': [
-            {'name': 'Cortex Trend Guard', 'status': 'ACTIVE', 'type': 'Trend Follower', 'description': 'Ensemble EMA + VWAP trend validation'},
-            {'name': 'Oversold Mean Revert', 'status': 'ACTIVE', 'type': 'Mean Reversion', 'description': 'RSI + Bollinger exhaustion capture'},
-            {'name': 'Llama Brain Validator', 'status': 'ACTIVE', 'type': 'AI Validation', 'description': 'Real-time LLM signal filtering'},
-            {'name': 'Volatility Breakout', 'status': 'STANDBY', 'type': 'Volatility', 'description': 'ATR expansion detection'},
-            {'name': 'ML Probability Shield', 'status': 'ACTIVE', 'type': 'ML Guard', 'description': 'Proprietary success probability filter'},
-            {'name': 'Fibonacci Retrace Alpha', 'status': 'ACTIVE', 'type': 'Structure', 'description': 'Capture 61.8% golden pocket pullbacks'},
-            {'name': 'MACD Divergence Hunter', 'status': 'ACTIVE', 'type': 'Momentum', 'description': 'Identify price vs momentum exhaustion'},
-            {'name': 'Smart Money Flow', 'status': 'STANDBY', 'type': 'Institutional', 'description': 'Detect large order block activity'},
-            {'name': 'Harmonic Bat Pattern', 'status': 'ACTIVE', 'type': 'Geometric', 'description': 'Advanced XABCD structure detection'},
-            {'name': 'EMA 200 Pullback', 'status': 'ACTIVE', 'type': 'Trend Follower', 'description': 'Institutional value area entry'},
-            {'name': 'Price Action Scalper', 'status': 'ACTIVE', 'type': 'Scalping', 'description': 'High-frequency candle formation analysis'},
-            {'name': 'Supply/Demand Zone', 'status': 'ACTIVE', 'type': 'Price Action', 'description': 'Market imbalance detection'},
-            {'name': 'Pivot Point Scanner', 'status': 'ACTIVE', 'type': 'Math', 'description': 'Daily/Weekly equilibrium levels'},
-            {'name': 'Gap Closure Alpha', 'status': 'ACTIVE', 'type': 'Anomaly', 'description': 'Opening gap filling logic'},
-            {'name': 'News Volatilty Filter', 'status': 'ACTIVE', 'type': 'Protection', 'description': 'High-impact economic event protection'}
-        ]
-    })
+    return etag_json(_STRATEGIES_BODY, _STRATEGIES_ETAG)
 
 # ========== WALL STREET GRADE APIs ==========
 
@@ -378,22 +474,20 @@ def get_strategies():
 @api.route('/ai/status')
 def ai_status():
     """Get AI (Ollama) health status"""
-    from app.services.ai_agent import ai_agent
-    return jsonify(ai_agent.get_status())
+    return ojson(_cached_ai_status())
 
 @api.route('/settings', methods=['GET'])
 def get_settings():
     """Get current trading settings"""
-    return jsonify(_settings)
+    return ojson_etag(_settings)
 
 @api.route('/settings', methods=['POST'])
 def update_settings():
     """Update trading settings"""
     data = request.get_json() or {}
-    for key in _settings:
-        if key in data:
-            _settings[key] = data[key]
-    return jsonify({"success": True, "settings": _settings})
+    accepted, rejected = coerce_settings(data)
+    _settings.update(accepted)
+    return ojson({"success": True, "settings": _settings, "rejected": rejected})
 
 @api.route('/telegram/test', methods=['POST'])
 def test_telegram():
@@ -403,31 +497,31 @@ def test_telegram():
     chat_id = data.get('chat_id')
     
     if not token or not chat_id:
-        return jsonify({'error': 'Missing Token or Chat ID'}), 400
+        return ojson({'error': 'Missing Token or Chat ID'}, 400)
         
-    import requests
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
+    from app.services.telegram_service import session, SEND_MESSAGE_URL
+    url = SEND_MESSAGE_URL.format(token=token)
     payload = {
         "chat_id": chat_id,
         "text": "🤖 Cortex AI: Test Connection Successful!\nYour trading bot is ready to send alerts."
     }
     
     try:
-        response = requests.post(url, json=payload, timeout=5)
+        response = session.post(url, json=payload, timeout=5)
         res_data = response.json()
         if response.status_code == 200 and res_data.get('ok'):
-            return jsonify({'status': 'success'})
+            return ojson({'status': 'success'})
         else:
-            return jsonify({'error': f"Telegram API Error: {res_data.get('description', 'Unknown error')}"}), 400
+            return ojson({'error': f"Telegram API Error: {res_data.get('description', 'Unknown error')}"}, 400)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojson({'error': str(e)}, 500)
 
 @api.route('/news')
 def get_news():
     """Get upcoming economic events"""
     from app.services.news_service import news_service
     events = news_service.get_upcoming_events(15)
-    return jsonify({"events": events})
+    return ojson({"events": events})
 
 @api.route('/news/check/<symbol>')
 def check_news_stop(symbol):
@@ -435,72 +529,58 @@ def check_news_stop(symbol):
     from app.services.news_service import news_service
     buffer = request.args.get('buffer', 30, type=int)
     result = news_service.check_news_stop(symbol, buffer)
-    return jsonify(result)
+    return ojson(result)
 
 @api.route('/indicators/<symbol>')
 def get_indicators(symbol):
     """Get current technical indicator values"""
-    from app.services.quant_engine import quant_engine
     from app.services.realtime_data import realtime_service
+    from app.services._indicators_njit import last_indicators
+    import numpy as np
     
     try:
-        candles = realtime_service.get_historical_candles(symbol, 'M5', 100)
-        df = pd.DataFrame([asdict(c) for c in candles])
-        
-        if df.empty:
-            return jsonify({"error": "No data"}), 404
+        bars = realtime_service.get_historical_arrays(symbol, 'M5', 100)
+        close = bars['close']
         
-        # Calculate indicators
-        close = df['close']
+        if close.size == 0:
+            return ojson({"error": "No data"}, 404)
         
-        # RSI
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        high = bars['high']
+        low = bars['low']
         
-        # EMAs
-        ema_20 = close.ewm(span=20, adjust=False).mean()
-        ema_50 = close.ewm(span=50, adjust=False).mean()
+        # RSI / EMA 20 / EMA 50 / ATR in a single compiled pass
+        rsi, ema_20, ema_50, atr = last_indicators(close, high, low)
         
-        # ATR
-        high = df['high']
-        low = df['low']
-        tr = pd.concat([high - low, abs(high - close.shift()), abs(low - close.shift())], axis=1).max(axis=1)
-        atr = tr.rolling(window=14).mean()
+        decimals = price_decimals(symbol)
         
-        decimals = 2 if symbol in ['XAUUSD', 'BTCUSD'] else 5
-        
-        return jsonify({
+        return ojson({
             "symbol": symbol,
-            "rsi": round(rsi.iloc[-1], 1) if not pd.isna(rsi.iloc[-1]) else 50.0,
-            "ema_20": round(ema_20.iloc[-1], decimals),
-            "ema_50": round(ema_50.iloc[-1], decimals),
-            "atr": round(atr.iloc[-1], decimals) if not pd.isna(atr.iloc[-1]) else 0,
-            "trend": "BULLISH" if ema_20.iloc[-1] > ema_50.iloc[-1] else "BEARISH",
-            "close": round(close.iloc[-1], decimals)
+            "rsi": round(rsi, 1) if not np.isnan(rsi) else 50.0,
+            "ema_20": round(ema_20, decimals),
+            "ema_50": round(ema_50, decimals),
+            "atr": round(atr, decimals) if not np.isnan(atr) else 0,
+            "trend": "BULLISH" if ema_20 > ema_50 else "BEARISH",
+            "close": round(close[-1], decimals)
         })
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojson({"error": str(e)}, 500)
 
 @api.route('/logs')
 def get_logs():
     """Get recent system logs for terminal view"""
-    return jsonify({"logs": _log_buffer[:50]})
+    return ojson_etag({"logs": list(islice(_log_buffer, 50))})
 
 @api.route('/system/status')
 def system_status():
     """Get comprehensive system status"""
     from app.services.realtime_data import realtime_service
-    from app.services.ai_agent import ai_agent
     from app.services.auto_trader import auto_trader
     
-    return jsonify({
+    return ojson_etag({
         "data_mode": realtime_service.data_mode,
         "mt5_connected": realtime_service.mt5_connected,
         "bridge_connected": realtime_service.bridge_connected,
-        "ai_status": ai_agent.get_status(),
+        "ai_status": _cached_ai_status(),
         "auto_trader_running": auto_trader.running,
         "settings": _settings
     })
@@ -1,5 +1,6 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
+import sqlalchemy as sa
 from app import db
 from app.models import RiskSettings, Strategy, UserPreferences
 from app.forms import RiskSettingsForm # Start using forms for robust handling? Or simplified for now.
@@ -9,16 +10,26 @@ settings = Blueprint('settings', __name__)
 @settings.route('/strategies', methods=['GET', 'POST'])
 @login_required
 def strategies():
-    user_strategies = Strategy.query.filter_by(user_id=current_user.id).all()
-    # Simple Toggle Logic (POST)
+    # Simple Toggle Logic (POST) - single UPDATE, no SELECT + ORM load first
     if request.method == 'POST':
-        strat_id = request.form.get('strategy_id')
-        strat = Strategy.query.get(strat_id)
-        if strat and strat.user_id == current_user.id:
-            strat.is_active = not strat.is_active
-            db.session.commit()
-            flash(f"Updated {strat.name}", "success")
+        strat_id = request.form.get('strategy_id', type=int)
+        result = db.session.execute(
+            sa.update(Strategy)
+            .where(Strategy.id == strat_id, Strategy.user_id == current_user.id)
+            .values(is_active=sa.not_(Strategy.is_active))
+            .returning(Strategy.name)
+        )
+        name = result.scalar_one_or_none()
+        db.session.commit()
+        if name is not None:
+            flash(f"Updated {name}", "success")
             return redirect(url_for('settings.strategies'))
+    
+    # The template only needs these columns, skip full object hydration
+    user_strategies = db.session.execute(
+        sa.select(Strategy.id, Strategy.name, Strategy.type, Strategy.is_active)
+        .filter_by(user_id=current_user.id)
+    ).all()
             
     return render_template('settings/strategies.html', strategies=user_strategies)
 
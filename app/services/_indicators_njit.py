@@ -0,0 +1,169 @@
+"""
+INDICATOR KERNELS (Numba)
+- Single-pass RSI / EMA / ATR on raw float64 arrays
+- Fused last_indicators() for /indicators, scalar last_* helpers for reuse
+- scan_stats() for the AutoTrader range/volatility checks
+- Only the final values are produced, no intermediate Series
+- Compiled nogil so concurrent request threads can run them in parallel
+"""
+import numpy as np
+from app.services._njit import njit
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def last_indicators(close, high, low, rsi_n=14, ema_fast=20, ema_slow=50, atr_n=14):
+    """
+    Returns (rsi, ema_fast, ema_slow, atr) for the last bar.
+    RSI and ATR use Wilder smoothing seeded with a simple mean,
+    EMAs use the adjust=False recurrence. RSI/ATR are NaN when
+    there are not enough bars to seed them.
+    """
+    n = close.shape[0]
+    a_fast = 2.0 / (ema_fast + 1.0)
+    a_slow = 2.0 / (ema_slow + 1.0)
+
+    ema_f = close[0]
+    ema_s = close[0]
+    avg_gain = 0.0
+    avg_loss = 0.0
+    atr = 0.0
+
+    for i in range(1, n):
+        c = close[i]
+        prev = close[i - 1]
+
+        # EMAs
+        ema_f = a_fast * c + (1.0 - a_fast) * ema_f
+        ema_s = a_slow * c + (1.0 - a_slow) * ema_s
+
+        # RSI gains/losses
+        delta = c - prev
+        gain = delta if delta > 0.0 else 0.0
+        loss = -delta if delta < 0.0 else 0.0
+        if i <= rsi_n:
+            avg_gain += gain / rsi_n
+            avg_loss += loss / rsi_n
+        else:
+            avg_gain = (avg_gain * (rsi_n - 1) + gain) / rsi_n
+            avg_loss = (avg_loss * (rsi_n - 1) + loss) / rsi_n
+
+        # True range
+        tr = high[i] - low[i]
+        hc = abs(high[i] - prev)
+        lc = abs(low[i] - prev)
+        if hc > tr:
+            tr = hc
+        if lc > tr:
+            tr = lc
+        if i <= atr_n:
+            atr += tr / atr_n
+        else:
+            atr = (atr * (atr_n - 1) + tr) / atr_n
+
+    if n <= rsi_n:
+        rsi = np.nan
+    elif avg_loss == 0.0:
+        rsi = 100.0
+    else:
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    if n <= atr_n:
+        atr = np.nan
+
+    return rsi, ema_f, ema_s, atr
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def last_ema(data, span, adjust=False):
+    """
+    Final EMA value. adjust=False is the plain recurrence (QuantEngine);
+    adjust=True matches pandas ewm(span=...).mean() defaults.
+    """
+    a = 2.0 / (span + 1.0)
+    decay = 1.0 - a
+    if not adjust:
+        e = data[0]
+        for i in range(1, data.shape[0]):
+            e = a * data[i] + decay * e
+        return e
+
+    num = 0.0
+    den = 0.0
+    for i in range(data.shape[0]):
+        num = data[i] + decay * num
+        den = 1.0 + decay * den
+    return num / den
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def last_rsi(close, period=14):
+    """Final Wilder RSI value, NaN without enough bars to seed"""
+    n = close.shape[0]
+    if n <= period:
+        return np.nan
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0.0 else 0.0
+        loss = -delta if delta < 0.0 else 0.0
+        if i <= period:
+            avg_gain += gain / period
+            avg_loss += loss / period
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+    if avg_loss == 0.0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def last_atr(high, low, close, period=14):
+    """Final Wilder ATR value, NaN without enough bars to seed"""
+    n = close.shape[0]
+    if n <= period:
+        return np.nan
+    atr = 0.0
+    for i in range(1, n):
+        prev = close[i - 1]
+        tr = high[i] - low[i]
+        hc = abs(high[i] - prev)
+        lc = abs(low[i] - prev)
+        if hc > tr:
+            tr = hc
+        if lc > tr:
+            tr = lc
+        if i <= period:
+            atr += tr / period
+        else:
+            atr = (atr * (period - 1) + tr) / period
+    return atr
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def scan_stats(high, low, close, range_n=14):
+    """
+    (range, volatility) for the AutoTrader scan in one pass, no temporaries:
+    high-low range of the last range_n bars, and the sample std (ddof=1)
+    of close-to-close returns in percent. Volatility is NaN below 3 bars.
+    """
+    n = close.shape[0]
+    hi = -np.inf
+    lo = np.inf
+    for i in range(max(0, n - range_n), n):
+        if high[i] > hi:
+            hi = high[i]
+        if low[i] < lo:
+            lo = low[i]
+
+    # Welford running mean/variance of the returns
+    mean = 0.0
+    m2 = 0.0
+    for i in range(1, n):
+        r = (close[i] - close[i - 1]) / close[i - 1]
+        d = r - mean
+        mean += d / i
+        m2 += d * (r - mean)
+    vol = np.sqrt(m2 / (n - 2)) * 100.0 if n > 2 else np.nan
+    return hi - lo, vol
@@ -0,0 +1,25 @@
+"""
+NUMBA SHIM
+- Re-exports numba's njit/prange when available
+- Falls back to plain Python so the services stay importable without numba
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    logger.warning("numba not installed - indicator kernels run as plain Python")
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and parametrised use)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
@@ -1,12 +1,70 @@
 from app.services.vector_util import vector_util
 import logging
 import requests
-import json
-from typing import Dict, Optional, List
+from requests.adapters import HTTPAdapter
+import orjson
+import os
+import re
+import hashlib
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# "decision": "..." in a reply that is not valid JSON as a whole
+_DECISION_FIELD_RE = re.compile(r'"decision"\s*:\s*"(BUY|SELL|HOLD)"', re.IGNORECASE)
+_BUY_RE = re.compile('BUY', re.IGNORECASE)
+_SELL_RE = re.compile('SELL', re.IGNORECASE)
+
+OLLAMA_NUM_PARALLEL = 4  # Concurrent generations the server decodes together
+HEALTH_TIMEOUT = 0.5  # Loopback answers in well under this; fail fast otherwise
+KEEP_ALIVE = "30m"  # Keep model weights resident between validations
+GENERATE_OPTIONS = {"num_predict": 128, "temperature": 0.2}  # The JSON verdict is short
+DECISION_CACHE_SIZE = 512  # Recent verdicts kept for identical re-validations
+DECISION_CACHE_TTL = 60.0  # Seconds a cached verdict stays valid
+
+# Fixed validation prompt, filled per signal by _build_validation_prompt
+PROMPT_TEMPLATE = """
+        [CONTEXT]
+        You are a Senior AI Trading Assistant. Your goal is to grow the user's asset capital by validating signals.
+        
+        [MARKET DATA]
+        Symbol: {symbol}
+        Direction: {direction}
+        Regime: {regime}
+        Confidence: {confidence}
+        Quant Reasoning: {reasoning}
+        
+        [STRATEGY PLAYBOOK]
+        {playbook}
+        
+        [INSTRUCTION]
+        Analyze the setup. If it matches the playbook and regime, output BUY or SELL. 
+        If too risky or contradictory, output HOLD.
+        
+        Respond ONLY with JSON:
+        {{
+            "decision": "BUY" | "SELL" | "HOLD",
+            "confidence": 0.0-1.0,
+            "reason": "One concise sentence explaining your logic."
+        }}
+        """
+
+def _is_complete_json(text: str) -> bool:
+    """True once the streamed text parses as a JSON object"""
+    text = text.strip()
+    if not text.endswith('}'):
+        return False
+    try:
+        orjson.loads(text)
+        return True
+    except orjson.JSONDecodeError:
+        return False
+
 class AIAgent:
     """
     The Brain of the system. 
@@ -19,16 +77,26 @@ class AIAgent:
         self.ollama_tags_url = "http://127.0.0.1:11434/api/tags"
         self.ollama_ready = False
         self.loaded_models = []
-        self._check_ollama_health()
+        self._warmed = False
+        # Keep-alive pool to the local Ollama server, reused by every call
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+        # LRU of (expiry, verdict) keyed by prompt hash, so identical re-validations skip the LLM
+        self._decisions = OrderedDict()
+        self._decisions_lock = Lock()
+        # Health is probed on first use, not at import time
+        self._health_checked = False
     
     def start_ollama_service(self) -> bool:
         """Attempts to start Ollama service if not running"""
         import subprocess
-        import time
         try:
             logger.info("Attempting to start Ollama service...")
             # Start in new console so it persists
-            subprocess.Popen(["ollama", "serve"], creationflags=subprocess.CREATE_NEW_CONSOLE)
+            # Let the server decode several validations in one batch
+            env = dict(os.environ)
+            env.setdefault('OLLAMA_NUM_PARALLEL', str(OLLAMA_NUM_PARALLEL))
+            subprocess.Popen(["ollama", "serve"], env=env, creationflags=subprocess.CREATE_NEW_CONSOLE)
             
             # Wait a bit for startup
             logger.info("Waiting 5s for Ollama to initialize...")
@@ -41,16 +109,31 @@ class AIAgent:
             logger.error(f"Failed to auto-start Ollama: {e}")
             return False
 
+    def _ensure_health_checked(self):
+        if not self._health_checked:
+            self._check_ollama_health()
+
+    def _get_tags(self):
+        """GET /api/tags with a short timeout and a single retry"""
+        try:
+            return self.session.get(self.ollama_tags_url, timeout=HEALTH_TIMEOUT)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            return self.session.get(self.ollama_tags_url, timeout=HEALTH_TIMEOUT)
+
     def _check_ollama_health(self):
         """Verify Ollama is running and has models loaded"""
+        self._health_checked = True
         try:
-            response = requests.get(self.ollama_tags_url, timeout=5)
+            response = self._get_tags()
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 self.loaded_models = [m.get('name', '') for m in data.get('models', [])]
                 if self.loaded_models:
                     self.ollama_ready = True
                     logger.info(f"Ollama READY: Models loaded - {self.loaded_models}")
+                    if not self._warmed and self.model in self.loaded_models:
+                        self._warmed = True
+                        Thread(target=self._warm_up, daemon=True).start()
                 else:
                     self.ollama_ready = False
                     logger.warning("Ollama running but NO MODELS loaded. Run: ollama pull llama3.1:8b")
@@ -62,8 +145,24 @@ class AIAgent:
             logger.error(f"AI Agent: Ollama connectivity error! Is the service bound to 127.0.0.1:11434? Error: {e}")
             logger.warning("Tip: Run 'ollama serve' if not running.")
     
+    def _warm_up(self):
+        """One-token generate so the model is loaded before the first real signal"""
+        try:
+            self.session.post(self.ollama_url, json={
+                "model": self.model,
+                "prompt": "ok",
+                "stream": False,
+                "keep_alive": KEEP_ALIVE,
+                "options": {"num_predict": 1}
+            }, timeout=60)
+            logger.info(f"AI Agent: {self.model} warmed up")
+        except Exception as e:
+            self._warmed = False
+            logger.warning(f"AI Agent: Model warm-up failed: {e}")
+    
     def get_status(self) -> Dict:
         """Return AI health status for API exposure"""
+        self._ensure_health_checked()
         return {
             "ollama_ready": self.ollama_ready,
             "loaded_models": self.loaded_models,
@@ -79,6 +178,7 @@ class AIAgent:
         logger.info(f"AI Agent: Validating {signal_data.get('direction')} signal for {symbol}")
         
         # CRITICAL: Check if Ollama is ready before proceeding
+        self._ensure_health_checked()
         if not self.ollama_ready:
             logger.warning("AI Agent: Ollama not ready - REJECTING signal (AI validation required)")
             return {
@@ -105,36 +205,34 @@ class AIAgent:
         # 2. Build the prompt
         prompt = self._build_validation_prompt(symbol, signal_data, regime, playbook)
         
+        key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+        with self._decisions_lock:
+            entry = self._decisions.get(key)
+            cached = None
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    cached = entry[1]
+                    self._decisions.move_to_end(key)
+                else:
+                    del self._decisions[key]
+        if cached is not None:
+            logger.info(f"AI Agent: Reusing cached verdict for {symbol}: {cached.get('decision')}")
+            return dict(cached)
+        
         logger.info(f"🧠 [BRAIN] Consulting with Llama 3.1 for {symbol}...")
         logger.info(f"   Context: {len(playbook)} chars from playbooks")
         
         # 3. Query Llama
         try:
-            response = requests.post(self.ollama_url, json={
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "format": "json"
-            }, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json().get('response', '{}')
-                try:
-                    validation = json.loads(result)
-                    logger.info(f"   Response: {validation.get('decision')} (Conf: {validation.get('confidence', 0)*100:.0f}%)")
-                    logger.info(f"   Reason: {validation.get('reason')}")
-                    logger.info(f"AI Agent: Validation complete. Result: {validation.get('decision')}")
-                    return validation
-                except json.JSONDecodeError:
-                    # If JSON parsing fails, try to extract decision from text
-                    logger.warning(f"AI Agent: Failed to parse JSON response: {result}")
-                    # Try to extract decision from text response
-                    if "BUY" in result.upper():
-                        return {"decision": "BUY", "confidence": 0.5, "reason": "AI approved (parsed from text)"}
-                    elif "SELL" in result.upper():
-                        return {"decision": "SELL", "confidence": 0.5, "reason": "AI approved (parsed from text)"}
-                    else:
-                        return {"decision": "HOLD", "confidence": 0.0, "reason": "AI response unclear"}
+            result = self._generate(prompt)
+            if result is not None:
+                decision, parsed = self._parse_decision(result)
+                if parsed:  # Text fallbacks are not worth repeating
+                    with self._decisions_lock:
+                        self._decisions[key] = (time.monotonic() + DECISION_CACHE_TTL, dict(decision))
+                        if len(self._decisions) > DECISION_CACHE_SIZE:
+                            self._decisions.popitem(last=False)
+                return decision
         except requests.exceptions.RequestException as e:
             logger.error(f"AI Agent validation failed (connection error): {e}")
         except Exception as e:
@@ -147,32 +245,76 @@ class AIAgent:
             "reason": "AI validation failed - cannot proceed without AI Brain approval."
         }
 
-    def _build_validation_prompt(self, symbol: str, signal: Dict, regime: str, playbook: str) -> str:
-        return f"""
-        [CONTEXT]
-        You are a Senior AI Trading Assistant. Your goal is to grow the user's asset capital by validating signals.
-        
-        [MARKET DATA]
-        Symbol: {symbol}
-        Direction: {signal.get('direction')}
-        Regime: {regime}
-        Confidence: {signal.get('confidence')}
-        Quant Reasoning: {", ".join(signal.get('reasoning', []))}
-        
-        [STRATEGY PLAYBOOK]
-        {playbook}
-        
-        [INSTRUCTION]
-        Analyze the setup. If it matches the playbook and regime, output BUY or SELL. 
-        If too risky or contradictory, output HOLD.
-        
-        Respond ONLY with JSON:
-        {{
-            "decision": "BUY" | "SELL" | "HOLD",
-            "confidence": 0.0-1.0,
-            "reason": "One concise sentence explaining your logic."
-        }}
+    def validate_signals_batch(self, items: List[Tuple[str, Dict, str]]) -> List[Dict]:
+        """
+        Validate several (symbol, signal_data, regime) signals at once.
+        Requests are issued concurrently over the shared session so Ollama
+        can batch them (OLLAMA_NUM_PARALLEL); results keep input order.
         """
+        if len(items) < 2:
+            return [self.validate_signal(*item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(OLLAMA_NUM_PARALLEL, len(items))) as pool:
+            return list(pool.map(lambda item: self.validate_signal(*item), items))
+
+    def _generate(self, prompt: str) -> Optional[str]:
+        """
+        Stream a JSON-format generation from Ollama and return the text.
+        Reading stops as soon as the verdict object is complete, which also
+        closes the request so Ollama stops generating trailing tokens.
+        """
+        with self.session.post(self.ollama_url, json={
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "format": "json",
+            "keep_alive": KEEP_ALIVE,
+            "options": GENERATE_OPTIONS
+        }, timeout=30, stream=True) as response:
+            if response.status_code != 200:
+                return None
+            
+            parts = []
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                token = chunk.get('response', '')
+                parts.append(token)
+                if chunk.get('done'):
+                    break
+                if '}' in token and _is_complete_json(''.join(parts)):
+                    break
+            return ''.join(parts) or '{}'
+    
+    def _parse_decision(self, result: str) -> Tuple[Dict, bool]:
+        """Turn the model's text into a decision dict, and whether it parsed as JSON"""
+        try:
+            validation = orjson.loads(result)
+            logger.info(f"   Response: {validation.get('decision')} (Conf: {validation.get('confidence', 0)*100:.0f}%)")
+            logger.info(f"   Reason: {validation.get('reason')}")
+            logger.info(f"AI Agent: Validation complete. Result: {validation.get('decision')}")
+            return validation, True
+        except orjson.JSONDecodeError:
+            # If JSON parsing fails, try to extract decision from text
+            logger.warning(f"AI Agent: Failed to parse JSON response: {result}")
+            field = _DECISION_FIELD_RE.search(result)
+            decision = field.group(1).upper() if field else None
+            # Otherwise any BUY, then any SELL, anywhere in the text (case-insensitive, no upper() copy)
+            if decision is None:
+                decision = "BUY" if _BUY_RE.search(result) else "SELL" if _SELL_RE.search(result) else "HOLD"
+            if decision != "HOLD":
+                return {"decision": decision, "confidence": 0.5, "reason": "AI approved (parsed from text)"}, False
+            return {"decision": "HOLD", "confidence": 0.0, "reason": "AI response unclear"}, False
+
+    def _build_validation_prompt(self, symbol: str, signal: Dict, regime: str, playbook: str) -> str:
+        return PROMPT_TEMPLATE.format(
+            symbol=symbol,
+            direction=signal.get('direction'),
+            regime=regime,
+            confidence=signal.get('confidence'),
+            reasoning=", ".join(signal.get('reasoning', [])),
+            playbook=playbook,
+        )
 
 # Singleton
 ai_agent = AIAgent()
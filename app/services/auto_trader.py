@@ -4,21 +4,43 @@ AUTOMATED TRADING BOT
 - Automatic signal generation
 - Automatic trade execution
 - Risk-managed position sizing
-- Stop loss / Take profit monitoring
+- Stop loss / Take profit monitoring on its own, faster cadence
 """
-from threading import Thread, Event
+from threading import Thread, Event, Lock
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple
 import time
 from app.services.risk_manager import risk_manager
 from app.services.ai_agent import ai_agent
 from app.services.ml_engine import ml_engine
 from app.services.vector_util import vector_util
 from app.services.settings_store import _settings  # Import global settings store
+from app.services._indicators_njit import scan_stats
+from app.services.symbol_meta import price_decimals
+from app.services.quant_engine import quant_engine
+from app.services.realtime_data import realtime_service
+from app.services.execution_engine import execution_engine
+from app.services.news_service import news_service
+from app.services.telegram_service import telegram_service
+from app.services.websocket_streamer import streamer
 import logging
-from dataclasses import asdict
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Dashboard settings read once per scan cycle, so one pipeline run sees consistent values
+ScanConfig = namedtuple('ScanConfig', 'min_confidence min_risk_reward ml_threshold telegram_chat_id')
+
+
+def scan_config() -> ScanConfig:
+    return ScanConfig(
+        min_confidence=_settings.get('quant_confidence', 40) / 100.0,
+        min_risk_reward=_settings.get('risk_reward_min', 1.5),
+        ml_threshold=_settings.get('ml_threshold', 60) / 100.0,
+        telegram_chat_id=_settings.get('telegram_chat_id') if _settings.get('telegram_enabled') else None,
+    )
+
 class AutoTrader:
     """
     Fully automated trading bot.
@@ -29,9 +51,13 @@ class AutoTrader:
         self.running = False
         self.stop_event = Event()
         self.thread = None
+        self._pos_thread = None
         self.symbols = ['EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD']
         self.scan_interval = 10  # seconds between scans (reduced for testing)
-        self.last_signal_time = {}
+        self.position_interval = 0.5  # seconds between mark-to-market passes over open positions
+        # Monotonic timestamps per symbol: last analysis started / last trade placed
+        self._last_analysis_time = {}
+        self._last_trade_time = {}
         self.signal_cooldown = 300  # 5 min cooldown between signals per symbol
         
         # Risk settings
@@ -40,6 +66,18 @@ class AutoTrader:
         self.min_confidence = 0.4  # 40% minimum confidence
         self.min_risk_reward = 1.5
         
+        # Short-lived AI/ML verdicts: key -> (monotonic timestamp, value)
+        self.decision_ttl = 30  # seconds
+        self._ai_cache = {}
+        self._ml_cache = {}
+        self._was_connected = False
+        
+        # Symbols are analysed in parallel; most of the time is MT5/LLM/news I/O
+        self._scan_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='scan')
+        self._state_lock = Lock()  # Guards _analyzing, the per-symbol timestamps and the verdict caches
+        self._exec_lock = Lock()   # One order placement at a time
+        self._analyzing = set()
+        
     def start(self):
         """Start automated trading - WITH VALIDATION"""
         if self.running:
@@ -57,6 +95,8 @@ class AutoTrader:
         self.stop_event.clear()
         self.thread = Thread(target=self._trading_loop, daemon=True)
         self.thread.start()
+        self._pos_thread = Thread(target=self._position_loop, daemon=True)
+        self._pos_thread.start()
         logger.info("===========================================")
         logger.info("AutoTrader STARTED - Thread spawned")
         logger.info(f"Symbols to scan: {self.symbols}")
@@ -70,9 +110,6 @@ class AutoTrader:
         Validates that all required systems are ready before engaging auto trading.
         Returns: {'ready': bool, 'reason': str}
         """
-        from app.services.realtime_data import realtime_service
-        from app.services.ai_agent import ai_agent
-        
         # 1. Check data connection (Require MT5 for Live Mode)
         if not realtime_service.mt5_connected:
             return {
@@ -116,13 +153,13 @@ class AutoTrader:
         """Stop automated trading"""
         self.running = False
         self.stop_event.set()
-        if self.thread:
-            self.thread.join(timeout=2)
+        for thread in (self.thread, self._pos_thread):
+            if thread:
+                thread.join(timeout=2)
         logger.info("AutoTrader stopped")
     
     def _broadcast_log(self, source: str, message: str, log_type: str = "info"):
         """Broadcast log message to the dashboard via websocket streamer"""
-        from app.services.websocket_streamer import streamer
         try:
             streamer.broadcast_log(source, message, log_type)
         except Exception as e:
@@ -141,28 +178,44 @@ class AutoTrader:
             
         # Check if we should analyze this tick
         # (e.g. avoid over-analyzing every single tick, once per second is plenty for 'live')
-        last_signal = self.last_signal_time.get(symbol, 0)
-        if time.time() - last_signal < 1.0: # 1s internal analysis throttle
+        last_analysis = self._last_analysis_time.get(symbol, float('-inf'))
+        if time.monotonic() - last_analysis < 1.0: # 1s internal analysis throttle
             return
             
         # Trigger market analysis
-        self._analyze_market(symbol)
+        self._analyze_market(symbol, scan_config())
 
-    def _analyze_market(self, symbol):
-        """Analyze market for a specific symbol"""
-        # REFRESH LIVE SETTINGS FROM UI
-        self.min_confidence = _settings.get('quant_confidence', 40) / 100.0
-        self.min_risk_reward = _settings.get('risk_reward_min', 1.5)
-        
-        from app.services.quant_engine import quant_engine
-        from app.services.realtime_data import realtime_service
-        from app.services.execution_engine import execution_engine
+    def _analyze_market(self, symbol, cfg: ScanConfig):
+        """Analyze market for a specific symbol, skipping it if already in progress"""
+        with self._state_lock:
+            if symbol in self._analyzing:
+                return
+            self._analyzing.add(symbol)
+            self._last_analysis_time[symbol] = time.monotonic()
+        try:
+            self._analyze_symbol(symbol, cfg)
+        finally:
+            with self._state_lock:
+                self._analyzing.discard(symbol)
+
+    def _analyze_symbol(self, symbol, cfg: ScanConfig):
+        """Signal -> AI -> ML -> news -> spread -> sizing -> execution pipeline"""
+        # LIVE SETTINGS FROM UI (snapshot taken for this scan)
+        self.min_confidence = cfg.min_confidence
+        self.min_risk_reward = cfg.min_risk_reward
         
         # LIVE GUARD: Check MT5 connection before analysis
         if not realtime_service.mt5_connected:
             self._broadcast_log("SYSTEM", "🛑 CRITICAL: MT5 Connection Lost! Trading Halted.", "error")
             logger.error(f"--- FAILED ANALYZING {symbol}: MT5 DISCONNECTED ---")
+            self._was_connected = False
             return
+        if not self._was_connected:
+            # Reconnected: verdicts from before the outage are not trusted
+            with self._state_lock:
+                self._ai_cache.clear()
+                self._ml_cache.clear()
+            self._was_connected = True
 
         logger.info(f"--- ANALYZING {symbol} ---")
         logger.info(f"Current Dashboard Settings: Conf >= {self.min_confidence*100}%, RR >= {self.min_risk_reward}")
@@ -171,27 +224,29 @@ class AutoTrader:
         if symbol in execution_engine.positions:
             return
             
-        # Check global cooldown
-        last_signal = self.last_signal_time.get(symbol, 0)
-        if time.time() - last_signal < self.signal_cooldown:
+        # Check per-symbol trade cooldown
+        last_trade = self._last_trade_time.get(symbol, float('-inf'))
+        if time.monotonic() - last_trade < self.signal_cooldown:
             return
             
         try:
-            # Get data and generate signal
-            candles = realtime_service.get_historical_candles(symbol, 'M1', 100)
+            # Get data as column arrays and generate signal
+            bars = realtime_service.get_historical_arrays(symbol, 'M1', 100)
+            close = bars['close']
             
             # VALIDATION: Ensure we have enough data to analyze
-            if not candles or len(candles) < 50:
-                logger.warning(f"[SCAN] {symbol}: Insufficient data ({len(candles) if candles else 0} candles). Skipping.")
+            if len(close) < 50:
+                logger.warning(f"[SCAN] {symbol}: Insufficient data ({len(close)} candles). Skipping.")
                 return
-                
-            df = pd.DataFrame([asdict(c) for c in candles])
             
             # VALIDATION: Check for valid price data
-            if df['close'].isna().any() or (df['close'] == 0).any():
+            if np.isnan(close).any() or (close == 0).any():
                 logger.warning(f"[SCAN] {symbol}: Invalid price data. Skipping.")
                 return
             
+            # The quant engine still takes a DataFrame; wrap the arrays without copying
+            df = pd.DataFrame(bars, copy=False)
+            bar_range, volatility = scan_stats(bars['high'], bars['low'], close)
             signal = quant_engine.generate_signal(df, symbol)
             
             if signal and signal.direction != 'NEUTRAL':
@@ -215,8 +270,7 @@ class AutoTrader:
                 
                 logger.info(f"  ✅ PASSED Risk/Quant Filters. Handing to AI Brain...")
                 # Step 4: AI Brain Validation (Llama 3.1) - REQUIRED ≥50% confidence
-                from app.services.quant_engine import MarketRegime
-                regime = quant_engine.detect_regime(df).value
+                regime = signal.regime
                     
                 self._broadcast_log("BRAIN", f"🧠 AI Validating {symbol} setup with Llama 3.1...", "info")
                 signal_data = {
@@ -224,7 +278,9 @@ class AutoTrader:
                     'confidence': signal.confidence,
                     'reasoning': signal.reasoning if hasattr(signal, 'reasoning') else []
                 }
-                ai_decision = ai_agent.validate_signal(symbol, signal_data, regime)
+                ai_key = (symbol, regime, signal.direction, round(signal.confidence, 1))
+                ai_decision = self._cached(self._ai_cache, ai_key, "AI verdict",
+                                           lambda: ai_agent.validate_signal(symbol, signal_data, regime))
                 ai_confidence = ai_decision.get('confidence', 0)
                 ai_reason = ai_decision.get('reason', 'No reason provided')
                 ai_decision_type = ai_decision.get('decision', 'HOLD')
@@ -242,14 +298,15 @@ class AutoTrader:
                 self._broadcast_log("BRAIN", f"✅ AI APPROVED: {ai_reason} (Conf: {ai_confidence*100:.0f}%)", "success")
                 
                 # Step 5: ML Probability Check (≥60% historical success rate)
-                from datetime import datetime
                 features = {
-                    "hour": datetime.now().hour,
-                    "volatility": df['close'].pct_change().std() * 100
+                    "hour": time.localtime().tm_hour,
+                    "volatility": volatility
                 }
                 # Step 5: ML Probability Check (Dashboard Controlled)
-                ml_threshold = _settings.get('ml_threshold', 60) / 100.0
-                prob = ml_engine.predict_probability(symbol, features)
+                ml_threshold = cfg.ml_threshold
+                ml_key = (symbol, features['hour'], round(features['volatility'], 2))
+                prob = self._cached(self._ml_cache, ml_key, "ML probability",
+                                    lambda: ml_engine.predict_probability(symbol, features))
                 
                 # Boost prob slightly if AI consensus is high
                 if ai_confidence > 0.8:
@@ -262,16 +319,14 @@ class AutoTrader:
                 self._broadcast_log("ML", f"✅ ML APPROVED: High Probability Setup ({prob*100:.1f}%)", "success")
                 
                 # Step 6: News Filter (blocks trades 30min before high-impact events)
-                from app.services.news_service import news_service
                 self._broadcast_log("NEWS", f"📰 Checking News Calendar...", "info")
                 news_check = news_service.check_news_stop(symbol, buffer_minutes=30)
                 if news_check.get('stop', False):
                     reason = news_check.get('reason', 'High Impact News')
                     self._broadcast_log("NEWS", f"❌ NEWS BLOCKED: {reason}", "warning")
                     # Notify Telegram
-                    if _settings.get('telegram_enabled') and _settings.get('telegram_chat_id'):
-                        from app.services.telegram_service import telegram_service
-                        telegram_service.notify_news_block(_settings['telegram_chat_id'], symbol, reason)
+                    if cfg.telegram_chat_id:
+                        telegram_service.notify_news_block(cfg.telegram_chat_id, symbol, reason)
                     return
                 self._broadcast_log("NEWS", f"✅ NEWS PASS: No immediate high-impact events", "success")
                 
@@ -280,8 +335,8 @@ class AutoTrader:
                 tick = realtime_service.get_live_price(symbol)
                 if tick:
                     spread = tick.ask - tick.bid
-                    # Calculate ATR for spread check
-                    atr = df['high'].iloc[-14:].max() - df['low'].iloc[-14:].min()
+                    # 14-bar high-low range (from scan_stats) stands in for ATR
+                    atr = bar_range
                     if atr > 0 and spread > 0.3 * atr:
                         self._broadcast_log("RISK", f"❌ SPREAD BLOCKED: Spread too wide ({spread:.5f} > 30% ATR)", "warning")
                         return
@@ -303,37 +358,60 @@ class AutoTrader:
                 if final_lot > base_lot:
                     self._broadcast_log("GROWTH", f"Compounding lot size: {final_lot} (Base: {base_lot})", "info")
                 
-                # Execute Trade
-                self._execute_trade(symbol, signal, final_lot, execution_engine, realtime_service)
-                self.last_signal_time[symbol] = time.time()
+                # Execute Trade (serialised so parallel scans can't race on positions)
+                with self._exec_lock:
+                    if symbol in execution_engine.positions:
+                        return
+                    self._execute_trade(symbol, signal, final_lot, execution_engine, realtime_service)
+                with self._state_lock:
+                    self._last_trade_time[symbol] = time.monotonic()
                 
         except Exception as e:
             logger.error(f"Analysis error for {symbol}: {e}")
 
+    def _cached(self, cache: dict, key: tuple, label: str, compute):
+        """Return a cached value younger than decision_ttl, else compute and store it"""
+        now = time.monotonic()
+        with self._state_lock:
+            hit = cache.get(key)
+        if hit is not None and now - hit[0] < self.decision_ttl:
+            logger.info(f"  Reusing {label} for {key[0]} (stale_age={now - hit[0]:.1f}s)")
+            return hit[1]
+        value = compute()  # Outside the lock, this is the slow LLM/model call
+        with self._state_lock:
+            cache[key] = (now, value)
+            if len(cache) > 256:
+                # Drop expired entries so the cache stays bounded
+                for k, (ts, _) in list(cache.items()):
+                    if now - ts >= self.decision_ttl:
+                        del cache[k]
+        return value
+
+    def _scan_symbol(self, symbol, cfg: ScanConfig):
+        if not self.running:
+            return
+        logger.info(f"[SCAN] Analyzing {symbol}...")
+        self._analyze_market(symbol, cfg)
+
     def _trading_loop(self):
-        """Background loop for market scanning and position maintenance"""
-        from app.services.realtime_data import realtime_service
-        from app.services.execution_engine import execution_engine
-        
+        """Background loop for market scanning; positions are maintained by _position_loop"""
         logger.info("AutoTrader: Trading loop thread RUNNING")
         print("[AUTOTRADER] Trading loop started inside thread!")
         
         scan_count = 0
+        next_deadline = time.monotonic()
         while not self.stop_event.is_set():
+            # Cadence is tunable live from the dashboard settings
+            self.scan_interval = max(1, _settings.get('scan_interval', self.scan_interval))
             try:
                 scan_count += 1
                 logger.info(f"[SCAN #{scan_count}] Scanning {len(self.symbols)} symbols...")
                 print(f"[AUTOTRADER] Scan #{scan_count} starting...")
                 
-                # SCAN ALL SYMBOLS FOR OPPORTUNITIES
-                for symbol in self.symbols:
-                    if not self.running:
-                        break
-                    logger.info(f"[SCAN] Analyzing {symbol}...")
-                    self._analyze_market(symbol)
-                
-                # Update positions with current prices
-                self._update_positions(execution_engine, realtime_service)
+                # SCAN ALL SYMBOLS FOR OPPORTUNITIES (in parallel)
+                if self.running:
+                    cfg = scan_config()
+                    list(self._scan_pool.map(lambda symbol: self._scan_symbol(symbol, cfg), list(self.symbols)))
                 
                 logger.info(f"[SCAN #{scan_count}] Complete. Next scan in {self.scan_interval}s")
                 
@@ -342,13 +420,38 @@ class AutoTrader:
                 import traceback
                 traceback.print_exc()
             
-            # Wait before next scan cycle
-            time.sleep(self.scan_interval)
+            # Wait for the next scan slot; wakes immediately on stop()
+            next_deadline += self.scan_interval
+            remaining = next_deadline - time.monotonic()
+            if remaining < 0:
+                next_deadline = time.monotonic()  # Scan overran, resync instead of bursting
+                remaining = 0
+            if self.stop_event.wait(remaining):
+                break
+    
+    def _position_loop(self):
+        """Mark open positions to market and enforce SL/TP, independently of the scan cadence"""
+        next_deadline = time.monotonic()
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            try:
+                self._update_positions(execution_engine, realtime_service)
+            except Exception as e:
+                logger.error(f"Position update error: {e}")
+            
+            elapsed = time.monotonic() - started
+            if elapsed > self.position_interval:
+                logger.warning(f"Position update took {elapsed:.2f}s (interval {self.position_interval}s)")
+            next_deadline += self.position_interval
+            remaining = next_deadline - time.monotonic()
+            if remaining < 0:
+                next_deadline = time.monotonic()
+                remaining = 0
+            if self.stop_event.wait(remaining):
+                break
     
     def _execute_trade(self, symbol, signal, lots, execution_engine, realtime_service):
         """Execute a trade based on signal and optimized lot size"""
-        from app.services.websocket_streamer import streamer
-        
         try:
             # Ensure lots is valid
             if lots <= 0:
@@ -366,7 +469,7 @@ class AutoTrader:
                 take_profit=signal.take_profit_2
             )
             
-            decimals = 2 if symbol in ['XAUUSD', 'BTCUSD'] else 5
+            decimals = price_decimals(symbol)
             
             if result.get('success'):
                 self._broadcast_log("TRADE", f"EXECUTED: {signal.direction} {symbol} @ {round(signal.entry_price, decimals)} | Ticket: #{result.get('ticket')}", "success")
@@ -389,13 +492,15 @@ class AutoTrader:
     
     def _update_positions(self, execution_engine, realtime_service):
         """Update all positions with current prices"""
-        prices = {}
-        for symbol in execution_engine.positions.keys():
-            tick = realtime_service.get_live_price(symbol)
-            if tick:
-                prices[symbol] = tick.bid  # Use bid for position valuation
+        symbols = list(execution_engine.positions)
+        if not symbols:
+            return
+        ticks = realtime_service.get_live_prices(symbols)
+        prices = {symbol: tick.bid for symbol, tick in ticks.items()}  # Use bid for position valuation
         
-        execution_engine.update_positions(prices)
+        # Same lock as order placement: SL/TP closes must not race a scan opening a position
+        with self._exec_lock:
+            execution_engine.update_positions(prices)
 
 # Singleton
 auto_trader = AutoTrader()
@@ -5,26 +5,31 @@ BACKTESTING ENGINE
 - Sharpe Ratio, Sortino Ratio, Max Drawdown
 - Trade-by-trade analysis
 - Monte Carlo simulation
+- Bar walk compiled with Numba over raw OHLC arrays
+- Stream mode: FP32 equity memmapped to disk, only a tail of trades kept
 """
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
-from enum import Enum
+from typing import Final, List, Dict, Optional
 from datetime import datetime
 import logging
+import tempfile
+from app.services._njit import njit, prange, NUMBA_AVAILABLE
+from app.services.symbol_meta import pip_scale
 
 logger = logging.getLogger(__name__)
 
-class TradeDirection(Enum):
-    LONG = "LONG"
-    SHORT = "SHORT"
+class TradeDirection:
+    """Direction codes, the same values as the 'dir' field of TRADE_DTYPE"""
+    LONG: Final[int] = 1
+    SHORT: Final[int] = -1
 
-@dataclass
+@dataclass(slots=True, repr=False, eq=False)
 class Trade:
     entry_time: datetime
     exit_time: Optional[datetime]
-    direction: TradeDirection
+    direction: int  # TradeDirection.LONG / SHORT
     entry_price: float
     exit_price: Optional[float]
     size: float
@@ -33,8 +38,37 @@ class Trade:
     pnl: float = 0.0
     pnl_pips: float = 0.0
     status: str = "OPEN"
+
+# One closed trade per record; timestamps are epoch seconds, dir is 1 (long) / -1 (short)
+TRADE_DTYPE = np.dtype([
+    ('entry_ts', '<i8'), ('exit_ts', '<i8'),
+    ('entry_px', '<f8'), ('exit_px', '<f8'),
+    ('size', '<f8'), ('sl', '<f8'), ('tp', '<f8'), ('pnl', '<f8'),
+    ('dir', 'i1'), ('status', 'i1'),
+])
+TRADE_STATUS_CLOSED = 1
+
+
+def trades_as_dataclass(records: np.ndarray, pip_scale: float = 1e4) -> List[Trade]:
+    """Materialise Trade objects from TRADE_DTYPE records, for legacy consumers"""
+    return [
+        Trade(
+            entry_time=datetime.fromtimestamp(r['entry_ts']),
+            exit_time=datetime.fromtimestamp(r['exit_ts']),
+            direction=r['dir'],
+            entry_price=r['entry_px'],
+            exit_price=r['exit_px'],
+            size=r['size'],
+            stop_loss=r['sl'],
+            take_profit=r['tp'],
+            pnl=r['pnl'],
+            pnl_pips=abs(r['exit_px'] - r['entry_px']) * pip_scale,
+            status="CLOSED" if r['status'] == TRADE_STATUS_CLOSED else "OPEN"
+        )
+        for r in (dict(zip(records.dtype.names, row)) for row in records.tolist())
+    ]
     
-@dataclass
+@dataclass(slots=True, repr=False, eq=False)
 class BacktestResult:
     total_trades: int
     winning_trades: int
@@ -51,29 +85,298 @@ class BacktestResult:
     largest_win: float
     largest_loss: float
     avg_trade_duration: float
-    trades: List[Trade] = field(default_factory=list)
-    equity_curve: List[float] = field(default_factory=list)
+    trade_records: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=TRADE_DTYPE))
+    equity_curve: np.ndarray = field(default_factory=lambda: np.empty(0))
+    pip_scale: float = 1e4
+
+    @property
+    def trades(self) -> List[Trade]:
+        """Trades as Trade objects, built on demand from trade_records"""
+        return trades_as_dataclass(self.trade_records, self.pip_scale)
+
+WARMUP_BARS = 100  # Bars of history before the first signal is evaluated
+TRADE_TAIL = 10_000  # Most recent trades a stream-mode result keeps in memory
+MC_PERCENTILES = (5, 25, 50, 75, 95)  # Bands reported by monte_carlo
+
+# Columns of the trade rows produced by _simulate_into
+TRADE_ENTRY_IDX, TRADE_EXIT_IDX, TRADE_DIR, TRADE_ENTRY, TRADE_EXIT, TRADE_SIZE, TRADE_SL, TRADE_TP, TRADE_PNL = range(9)
+
+
+@njit(cache=True, nogil=True)
+def _scan_exit(high, low, start, is_long, sl, tp):
+    """First bar from `start` that touches SL (checked first) or TP, and the fill price"""
+    for j in range(start, high.shape[0]):
+        if is_long:
+            if low[j] <= sl:
+                return j, sl
+            if high[j] >= tp:
+                return j, tp
+        else:
+            if high[j] >= sl:
+                return j, sl
+            if low[j] <= tp:
+                return j, tp
+    return -1, np.nan
+
+
+def _scan_exit_numpy(high, low, start, is_long, sl, tp):
+    """
+    Vectorised _scan_exit for when numba is missing: tests SL/TP hits over
+    doubling windows, so short holds stay cheap and long ones take few passes.
+    """
+    n = high.shape[0]
+    j, width = start, 64
+    while j < n:
+        end = min(n, j + width)
+        if is_long:
+            sl_hit = low[j:end] <= sl
+            tp_hit = high[j:end] >= tp
+        else:
+            sl_hit = high[j:end] >= sl
+            tp_hit = low[j:end] <= tp
+        hit = sl_hit | tp_hit
+        if hit.any():
+            k = int(hit.argmax())
+            return j + k, (sl if sl_hit[k] else tp)  # SL wins a same-bar tie
+        j, width = end, width * 2
+    return -1, np.nan
+
+
+if not NUMBA_AVAILABLE:
+    _scan_exit = _scan_exit_numpy
+
+
+@njit(cache=True, nogil=True)
+def _hold(high, low, close, i, is_long, entry, sl, tp, size, capital, equity, start):
+    """
+    Carry a position opened on bar i to its exit, writing marked-to-market
+    equity for every bar held. Returns (exit_idx, exit_price, pnl, hit);
+    hit is False when data ran out and the trade was closed on the last close.
+    """
+    n = close.shape[0]
+    sign = 1.0 if is_long else -1.0
+    j, price = _scan_exit(high, low, i + 1, is_long, sl, tp)
+    last = j if j >= 0 else n
+    equity[i - start + 1:last - start + 1] = capital + sign * (close[i:last] - entry) * size
+    if j < 0:
+        price = close[n - 1]
+        pnl = sign * (price - entry) * size
+        return n - 1, price, pnl, False
+    pnl = sign * (price - entry) * size
+    equity[j - start + 1] = capital + pnl
+    return j, price, pnl, True
+
+
+@njit(cache=True, nogil=True)
+def _simulate_into(high, low, close, dirs, entries, sls, tps, start, risk_pct, capital, equity, trades):
+    """Single-pass backtest over signal arrays into preallocated outputs -> (n_trades, final capital)"""
+    n = close.shape[0]
+    equity[0] = capital
+    k = 0
+    i = start
+    while i < n:
+        d = dirs[i]
+        risk_per_unit = abs(entries[i] - sls[i])
+        if d == 0 or not risk_per_unit > 0.0:
+            equity[i - start + 1] = capital
+            i += 1
+            continue
+        is_long = d > 0
+        size = capital * risk_pct / risk_per_unit
+        exit_idx, price, pnl, hit = _hold(
+            high, low, close, i, is_long, entries[i], sls[i], tps[i], size, capital, equity, start
+        )
+        row = trades[k]
+        row[TRADE_ENTRY_IDX] = i
+        row[TRADE_EXIT_IDX] = exit_idx
+        row[TRADE_DIR] = 1.0 if is_long else -1.0
+        row[TRADE_ENTRY] = entries[i]
+        row[TRADE_EXIT] = price
+        row[TRADE_SIZE] = size
+        row[TRADE_SL] = sls[i]
+        row[TRADE_TP] = tps[i]
+        row[TRADE_PNL] = pnl
+        k += 1
+        capital += pnl
+        i = exit_idx + 1 if hit else n
+    return k, capital
+
+
+def _max_trades(n_bars: int) -> int:
+    # Every closed trade spans at least two bars (entry, then exit), so this never overflows
+    return max(n_bars - WARMUP_BARS, 0) // 2 + 1
+
+
+@njit(cache=True, parallel=True)
+def _simulate_batch(high, low, close, dirs, entries, sls, tps, start, risk_pct, capital, max_trades):
+    """
+    _simulate_into for k parameter sets at once, one per row of the (k, n) signal
+    arrays, run in parallel. Trades go into a per-set arena of max_trades rows.
+    """
+    k = dirs.shape[0]
+    m = max(close.shape[0] - start, 0)
+    equity = np.empty((k, m + 1))
+    arena = np.empty((k, max_trades, 9))
+    counts = np.zeros(k, dtype=np.int64)
+    for p in prange(k):
+        counts[p], _ = _simulate_into(
+            high, low, close, dirs[p], entries[p], sls[p], tps[p], start, risk_pct, capital, equity[p], arena[p]
+        )
+    return equity, arena, counts
+
+
+@njit(cache=True, nogil=True)
+def _max_dd(equity):
+    """(max drawdown, max drawdown %) of an equity curve in one pass"""
+    running = equity[0]
+    max_dd = 0.0
+    max_dd_pct = 0.0
+    for v in equity:
+        if v > running:
+            running = v
+        dd = running - v
+        if dd > max_dd:
+            max_dd = dd
+        pct = dd / running if running > 0 else 0.0
+        if pct > max_dd_pct:
+            max_dd_pct = pct
+    return max_dd, max_dd_pct * 100
+
+
+@njit(cache=True, nogil=True)
+def _return_stats(equity):
+    """
+    (mean, std, downside std) of bar-to-bar returns in one pass, via
+    Welford updates; population std, downside std over negative returns only
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    n_down = 0
+    mean_down = 0.0
+    m2_down = 0.0
+    for i in range(equity.shape[0] - 1):
+        r = (equity[i + 1] - equity[i]) / equity[i]
+        n += 1
+        delta = r - mean
+        mean += delta / n
+        m2 += delta * (r - mean)
+        if r < 0:
+            n_down += 1
+            delta = r - mean_down
+            mean_down += delta / n_down
+            m2_down += delta * (r - mean_down)
+    if n == 0:
+        return np.nan, 0.0, 0.0
+    std_down = np.sqrt(m2_down / n_down) if n_down else 0.0
+    return mean, np.sqrt(m2 / n), std_down
+
+
+def _max_dd_numpy(equity):
+    running_max = np.maximum.accumulate(equity)
+    underwater = running_max - equity
+    return underwater.max(), np.divide(underwater, running_max, out=underwater).max() * 100
+
+
+def _return_stats_numpy(equity):
+    returns = np.diff(equity)
+    np.divide(returns, equity[:-1], out=returns)
+    if not len(returns):
+        return np.nan, 0.0, 0.0
+    downside = returns[returns < 0]
+    return returns.mean(), returns.std(), (downside.std() if len(downside) else 0.0)
+
+
+if not NUMBA_AVAILABLE:
+    # Interpreted loops would be far slower than the array passes
+    _max_dd = _max_dd_numpy
+    _return_stats = _return_stats_numpy
+
+
+def _ohlc_arrays(df: pd.DataFrame):
+    return tuple(np.ascontiguousarray(df[c].to_numpy(dtype=np.float64)) for c in ('high', 'low', 'close'))
+
+
+def _bar_timestamps(df: pd.DataFrame) -> np.ndarray:
+    """Bar open times as int64 epoch seconds; 'now' when the frame has no time column"""
+    if 'time' not in df:
+        return np.full(len(df), int(datetime.now().timestamp()), dtype=np.int64)
+    times = df['time'].to_numpy()
+    if times.dtype.kind == 'M':
+        return times.astype('datetime64[s]').astype(np.int64)
+    if times.dtype.kind in 'iuf':
+        return times.astype(np.int64)
+    return pd.to_datetime(times).to_numpy().astype('datetime64[s]').astype(np.int64)
+
+
+def _trade_records(rows: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+    """TRADE_DTYPE records from kernel trade rows (TRADE_* columns)"""
+    records = np.empty(len(rows), dtype=TRADE_DTYPE)
+    records['entry_ts'] = timestamps[rows[:, TRADE_ENTRY_IDX].astype(np.int64)]
+    records['exit_ts'] = timestamps[rows[:, TRADE_EXIT_IDX].astype(np.int64)]
+    records['entry_px'] = rows[:, TRADE_ENTRY]
+    records['exit_px'] = rows[:, TRADE_EXIT]
+    records['size'] = rows[:, TRADE_SIZE]
+    records['sl'] = rows[:, TRADE_SL]
+    records['tp'] = rows[:, TRADE_TP]
+    records['pnl'] = rows[:, TRADE_PNL]
+    records['dir'] = rows[:, TRADE_DIR]
+    records['status'] = TRADE_STATUS_CLOSED
+    return records
 
 class BacktestEngine:
     """
     Professional backtesting engine for strategy validation.
     """
     
-    def __init__(self, initial_capital: float = 10000.0):
+    def __init__(self, initial_capital: float = 10000.0, mode: str = 'full',
+                 equity_mmap_path: Optional[str] = None, trades_path: Optional[str] = None):
+        """
+        mode='stream' bounds memory for long backtests: the equity curve is
+        an FP32 memmap (equity_mmap_path, or an anonymous temp file), and
+        results keep only the last TRADE_TAIL trades, the full set going to
+        trades_path (Parquet if pyarrow is installed, else .npy).
+        Metrics are computed over every bar and trade in both modes.
+        """
+        if mode not in ('full', 'stream'):
+            raise ValueError(f"Unknown backtest mode: {mode}")
         self.initial_capital = initial_capital
+        self.mode = mode
+        self.equity_mmap_path = equity_mmap_path
+        self.trades_path = trades_path
         self.capital = initial_capital
-        self.trades: List[Trade] = []
-        self.equity_curve: List[float] = [initial_capital]
-        self.current_position: Optional[Trade] = None
+        self.trades_arr: np.ndarray = np.empty(0, dtype=TRADE_DTYPE)
+        self.equity_curve: np.ndarray = np.array([initial_capital])
+        self.pip_scale = 1e4
     
-    def reset(self):
-        """Reset backtester state"""
+    def reset(self, symbol: Optional[str] = None):
+        """Reset backtester state; symbol sets the pip scale (forex default)"""
         self.capital = self.initial_capital
-        self.trades = []
-        self.equity_curve = [self.initial_capital]
-        self.current_position = None
+        self.pip_scale = pip_scale(symbol) if symbol else 1e4
+        self.trades_arr = np.empty(0, dtype=TRADE_DTYPE)
+        self.equity_curve = np.array([self.initial_capital])
     
-    def run_backtest(self, df: pd.DataFrame, strategy_func, risk_per_trade: float = 0.02) -> BacktestResult:
+    def _equity_buffer(self, n_bars: int) -> np.ndarray:
+        """Output array for the equity curve of an n_bars backtest"""
+        size = max(n_bars - WARMUP_BARS, 0) + 1
+        if self.mode == 'full':
+            return np.empty(size)
+        target = self.equity_mmap_path or tempfile.TemporaryFile()
+        return np.memmap(target, dtype=np.float32, mode='w+', shape=(size,))
+    
+    def _store_trades(self, records: np.ndarray):
+        """Write the full trade set to trades_path"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            np.save(self.trades_path, records)
+            logger.warning(f"pyarrow not installed, trades saved with np.save to {self.trades_path}")
+            return
+        pq.write_table(pa.table({name: records[name] for name in records.dtype.names}), self.trades_path)
+    
+    def run_backtest(self, df: pd.DataFrame, strategy_func, risk_per_trade: float = 0.02,
+                     symbol: Optional[str] = None) -> BacktestResult:
         """
         Run backtest on historical data.
         
@@ -81,186 +384,201 @@ class BacktestEngine:
             df: DataFrame with OHLC data
             strategy_func: Function that takes df and returns (direction, entry, sl, tp) or None
             risk_per_trade: Risk per trade as decimal (0.02 = 2%)
+            symbol: Traded symbol, used for pip figures
+        
+        The strategy is only consulted while flat; once a trade is open the
+        bars up to its exit are walked by the compiled _hold kernel.
         """
-        self.reset()
+        self.reset(symbol)
+        high, low, close = _ohlc_arrays(df)
+        n = len(close)
+        equity = self._equity_buffer(n)
+        equity[0] = self.capital
+        rows = np.empty((_max_trades(n), 9))
+        n_trades = 0
         
-        for i in range(100, len(df)):
-            current_bar = df.iloc[i]
-            historical_df = df.iloc[:i+1]
-            
-            # Check if we have an open position
-            if self.current_position:
-                self._check_exit(current_bar)
-            else:
-                # Check for new signal
-                signal = strategy_func(historical_df)
-                if signal:
-                    direction, entry, sl, tp = signal
-                    self._open_trade(
-                        current_bar['time'] if 'time' in current_bar else datetime.now(),
-                        direction,
-                        entry,
-                        sl,
-                        tp,
-                        risk_per_trade
+        i = WARMUP_BARS
+        while i < n:
+            signal = strategy_func(df.iloc[:i+1])
+            if signal:
+                direction, entry, sl, tp = signal
+                risk_per_unit = abs(entry - sl)
+                if risk_per_unit > 0:
+                    is_long = direction == "BUY"
+                    size = self.capital * risk_per_trade / risk_per_unit
+                    exit_idx, exit_price, pnl, hit = _hold(
+                        high, low, close, i, is_long, entry, sl, tp, size, self.capital, equity, WARMUP_BARS
                     )
-            
-            # Update equity curve
-            current_equity = self.capital
-            if self.current_position:
-                unrealized = self._calculate_unrealized_pnl(current_bar['close'])
-                current_equity += unrealized
-            self.equity_curve.append(current_equity)
-        
-        # Close any remaining position
-        if self.current_position:
-            self.current_position.exit_price = df.iloc[-1]['close']
-            self.current_position.exit_time = df.iloc[-1]['time'] if 'time' in df.iloc[-1] else datetime.now()
-            self._close_position()
+                    rows[n_trades] = (i, exit_idx, 1 if is_long else -1, entry, exit_price, size, sl, tp, pnl)
+                    n_trades += 1
+                    self.capital += pnl
+                    i = exit_idx + 1 if hit else n
+                    continue
+            equity[i - WARMUP_BARS + 1] = self.capital
+            i += 1
         
+        self.trades_arr = _trade_records(rows[:n_trades], _bar_timestamps(df))
+        self.equity_curve = equity
         return self._calculate_results()
     
-    def _open_trade(self, time, direction: str, entry: float, sl: float, tp: float, risk_pct: float):
-        """Open a new trade"""
-        risk_amount = self.capital * risk_pct
-        risk_per_unit = abs(entry - sl)
-        
-        if risk_per_unit == 0:
-            return
-        
-        size = risk_amount / risk_per_unit
-        
-        self.current_position = Trade(
-            entry_time=time if isinstance(time, datetime) else datetime.fromtimestamp(time),
-            exit_time=None,
-            direction=TradeDirection.LONG if direction == "BUY" else TradeDirection.SHORT,
-            entry_price=entry,
-            exit_price=None,
-            size=size,
-            stop_loss=sl,
-            take_profit=tp,
-            status="OPEN"
+    def run_signals(self, df: pd.DataFrame, directions: np.ndarray, entries: np.ndarray,
+                    stop_losses: np.ndarray, take_profits: np.ndarray,
+                    risk_per_trade: float = 0.02, symbol: Optional[str] = None) -> BacktestResult:
+        """
+        Run a backtest from precomputed per-bar signal arrays, entirely in
+        the compiled kernel. directions holds 1 (BUY), -1 (SELL) or 0 for
+        each bar; entries/stop_losses/take_profits are read on signal bars.
+        Same fill rules as run_backtest.
+        """
+        self.reset(symbol)
+        high, low, close = _ohlc_arrays(df)
+        n = len(close)
+        equity = self._equity_buffer(n)
+        rows = np.empty((_max_trades(n), 9))
+        n_trades, self.capital = _simulate_into(
+            high, low, close,
+            np.ascontiguousarray(directions, dtype=np.int64),
+            np.ascontiguousarray(entries, dtype=np.float64),
+            np.ascontiguousarray(stop_losses, dtype=np.float64),
+            np.ascontiguousarray(take_profits, dtype=np.float64),
+            WARMUP_BARS, risk_per_trade, self.capital, equity, rows
         )
+        self.trades_arr = _trade_records(rows[:n_trades], _bar_timestamps(df))
+        self.equity_curve = equity
+        return self._calculate_results()
     
-    def _check_exit(self, bar):
-        """Check if position should be closed"""
-        if not self.current_position:
-            return
-        
-        pos = self.current_position
+    def run_batch(self, df: pd.DataFrame, directions: np.ndarray, entries: np.ndarray,
+                  stop_losses: np.ndarray, take_profits: np.ndarray, risk_per_trade: float = 0.02):
+        """
+        Backtest k parameter sets in one parallel pass. Signal arrays are
+        (n_bars, k), one column per set, with run_signals semantics.
         
-        if pos.direction == TradeDirection.LONG:
-            # Check stop loss
-            if bar['low'] <= pos.stop_loss:
-                pos.exit_price = pos.stop_loss
-                self._close_position(bar)
-                return
-            # Check take profit
-            if bar['high'] >= pos.take_profit:
-                pos.exit_price = pos.take_profit
-                self._close_position(bar)
-                return
-        else:  # SHORT
-            # Check stop loss
-            if bar['high'] >= pos.stop_loss:
-                pos.exit_price = pos.stop_loss
-                self._close_position(bar)
-                return
-            # Check take profit
-            if bar['low'] <= pos.take_profit:
-                pos.exit_price = pos.take_profit
-                self._close_position(bar)
-                return
+        Returns (equity_curves, trades, offsets): equity_curves is
+        (n_bars - WARMUP_BARS + 1, k), trades holds the TRADE_* rows of all
+        sets back to back, and set p owns trades[offsets[p]:offsets[p+1]].
+        """
+        high, low, close = _ohlc_arrays(df)
+        equity, arena, counts = _simulate_batch(
+            high, low, close,
+            np.ascontiguousarray(np.asarray(directions).T, dtype=np.int64),
+            np.ascontiguousarray(np.asarray(entries).T, dtype=np.float64),
+            np.ascontiguousarray(np.asarray(stop_losses).T, dtype=np.float64),
+            np.ascontiguousarray(np.asarray(take_profits).T, dtype=np.float64),
+            WARMUP_BARS, risk_per_trade, self.initial_capital, _max_trades(len(close))
+        )
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        trades = np.concatenate([arena[p, :c] for p, c in enumerate(counts)]) if len(counts) else np.empty((0, 9))
+        return equity.T, trades, offsets
     
-    def _close_position(self, bar=None):
-        """Close current position"""
-        if not self.current_position:
-            return
-        
-        pos = self.current_position
-        
-        if bar:
-            pos.exit_time = bar['time'] if 'time' in bar else datetime.now()
-        
-        # Calculate PnL
-        if pos.direction == TradeDirection.LONG:
-            pos.pnl = (pos.exit_price - pos.entry_price) * pos.size
-        else:
-            pos.pnl = (pos.entry_price - pos.exit_price) * pos.size
+    def batch_result(self, df: pd.DataFrame, batch, column: int,
+                     symbol: Optional[str] = None) -> BacktestResult:
+        """BacktestResult for one column of a run_batch() result"""
+        self.reset(symbol)
+        equity, trades, offsets = batch
+        rows = trades[offsets[column]:offsets[column + 1]]
+        self.trades_arr = _trade_records(rows, _bar_timestamps(df))
+        self.equity_curve = np.ascontiguousarray(equity[:, column])
+        self.capital = self.initial_capital + float(rows[:, TRADE_PNL].sum())
+        return self._calculate_results()
+    
+    def monte_carlo(self, n_sims: int = 10_000, backend: str = 'auto', seed: Optional[int] = None) -> Dict:
+        """
+        Bootstrap the last run's trade P&Ls: each simulation resamples the
+        trades with replacement into one row of an (n_sims, n_trades) matrix,
+        so every equity path is a single cumsum. backend is 'cupy' (GPU),
+        'numpy', or 'auto' (CuPy when installed). In stream mode only the
+        retained trade tail is resampled.
         
-        pos.pnl_pips = abs(pos.exit_price - pos.entry_price) * 10000  # For forex
-        pos.status = "CLOSED"
+        Returns percentile bands (MC_PERCENTILES) of final equity and max
+        drawdown %, as plain floats.
+        """
+        xp = np
+        if backend != 'numpy':
+            try:
+                import cupy as xp
+            except ImportError:
+                if backend == 'cupy':
+                    raise
         
-        self.capital += pos.pnl
-        self.trades.append(pos)
-        self.current_position = None
-    
-    def _calculate_unrealized_pnl(self, current_price: float) -> float:
-        """Calculate unrealized PnL"""
-        if not self.current_position:
-            return 0.0
+        n = len(self.trades_arr)
+        if not n:
+            raise ValueError("No trades to resample, run a backtest first")
+        pnls = xp.asarray(self.trades_arr['pnl'])
+        idx = xp.random.RandomState(seed).randint(0, n, size=(n_sims, n))
+        equity = xp.cumsum(pnls[idx], axis=1)
+        equity += self.initial_capital
+        running_max = xp.maximum(xp.maximum.accumulate(equity, axis=1), self.initial_capital)
+        dd_pct = ((running_max - equity) / running_max).max(axis=1) * 100
         
-        pos = self.current_position
-        if pos.direction == TradeDirection.LONG:
-            return (current_price - pos.entry_price) * pos.size
-        else:
-            return (pos.entry_price - current_price) * pos.size
+        bands = xp.asarray(MC_PERCENTILES, dtype=np.float64)
+        final = getattr(xp, 'asnumpy', np.asarray)(xp.percentile(equity[:, -1], bands))
+        dd = getattr(xp, 'asnumpy', np.asarray)(xp.percentile(dd_pct, bands))
+        return {
+            'n_sims': n_sims,
+            'n_trades': n,
+            'final_equity': {f"p{p}": float(v) for p, v in zip(MC_PERCENTILES, final)},
+            'max_drawdown_percent': {f"p{p}": float(v) for p, v in zip(MC_PERCENTILES, dd)},
+        }
     
     def _calculate_results(self) -> BacktestResult:
         """Calculate comprehensive backtest results"""
-        if not self.trades:
+        records = self.trades_arr
+        if self.mode == 'stream':
+            if self.trades_path:
+                self._store_trades(records)
+            # Metrics below still see every trade; only the tail outlives this call
+            self.trades_arr = records[-TRADE_TAIL:].copy()
+        
+        if not len(records):
             return BacktestResult(
                 total_trades=0, winning_trades=0, losing_trades=0,
                 win_rate=0, total_pnl=0, max_drawdown=0, max_drawdown_percent=0,
                 sharpe_ratio=0, sortino_ratio=0, profit_factor=0,
                 avg_win=0, avg_loss=0, largest_win=0, largest_loss=0,
-                avg_trade_duration=0, trades=[], equity_curve=self.equity_curve
+                avg_trade_duration=0, trade_records=self.trades_arr, equity_curve=self.equity_curve,
+                pip_scale=self.pip_scale
             )
         
-        pnls = [t.pnl for t in self.trades]
-        wins = [p for p in pnls if p > 0]
-        losses = [p for p in pnls if p < 0]
-        
-        # Max Drawdown
-        equity = np.array(self.equity_curve)
-        running_max = np.maximum.accumulate(equity)
-        drawdowns = (running_max - equity) / running_max
-        max_dd_pct = np.max(drawdowns) * 100
-        max_dd = np.max(running_max - equity)
+        n = len(records)
+        pnls = records['pnl']
+        wins = pnls[pnls > 0]
+        losses = pnls[pnls < 0]
         
-        # Returns for Sharpe/Sortino
-        returns = np.diff(equity) / equity[:-1]
+        # Max Drawdown and return moments, each a single pass over equity
+        max_dd, max_dd_pct = _max_dd(self.equity_curve)
+        mean_return, std_return, downside_std = _return_stats(self.equity_curve)
         
         # Sharpe Ratio (annualized, assuming daily)
-        sharpe = np.mean(returns) / np.std(returns) * np.sqrt(252) if np.std(returns) > 0 else 0
+        sharpe = mean_return / std_return * np.sqrt(252) if std_return > 0 else 0
         
         # Sortino Ratio
-        downside_returns = returns[returns < 0]
-        sortino = np.mean(returns) / np.std(downside_returns) * np.sqrt(252) if len(downside_returns) > 0 and np.std(downside_returns) > 0 else 0
+        sortino = mean_return / downside_std * np.sqrt(252) if downside_std > 0 else 0
         
         # Profit Factor
-        gross_profit = sum(wins) if wins else 0
-        gross_loss = abs(sum(losses)) if losses else 1
+        gross_profit = wins.sum()
+        gross_loss = -losses.sum() if len(losses) else 1
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
         
         return BacktestResult(
-            total_trades=len(self.trades),
+            total_trades=n,
             winning_trades=len(wins),
             losing_trades=len(losses),
-            win_rate=len(wins) / len(self.trades) * 100 if self.trades else 0,
-            total_pnl=sum(pnls),
-            max_drawdown=max_dd,
-            max_drawdown_percent=max_dd_pct,
-            sharpe_ratio=sharpe,
-            sortino_ratio=sortino,
-            profit_factor=profit_factor,
-            avg_win=np.mean(wins) if wins else 0,
-            avg_loss=np.mean(losses) if losses else 0,
-            largest_win=max(wins) if wins else 0,
-            largest_loss=min(losses) if losses else 0,
+            win_rate=len(wins) / n * 100,
+            total_pnl=float(pnls.sum()),
+            max_drawdown=float(max_dd),
+            max_drawdown_percent=float(max_dd_pct),
+            sharpe_ratio=float(sharpe),
+            sortino_ratio=float(sortino),
+            profit_factor=float(profit_factor),
+            avg_win=float(wins.mean()) if len(wins) else 0,
+            avg_loss=float(losses.mean()) if len(losses) else 0,
+            largest_win=float(wins.max()) if len(wins) else 0,
+            largest_loss=float(losses.min()) if len(losses) else 0,
             avg_trade_duration=0,  # TODO: Calculate from exit_time - entry_time
-            trades=self.trades,
-            equity_curve=self.equity_curve
+            trade_records=self.trades_arr,
+            equity_curve=self.equity_curve,
+            pip_scale=self.pip_scale
         )
 
 # Singleton
@@ -0,0 +1,106 @@
+"""
+BAR RING BUFFER
+- Per (symbol, timeframe) OHLCV cache as NumPy column arrays
+- Incremental merge of the last few bars fetched from the broker
+- Tail reads are zero-copy, contiguous, read-only views; closed bars in them never change
+"""
+import numpy as np
+from typing import Dict
+
+FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+
+class BarRing:
+    """
+    Fixed-capacity bar store backed by arrays of 2x capacity, so the newest
+    `capacity` bars are always one contiguous slice. Closed bars handed out
+    by tail() are never written again: when the back fills up, or the source
+    revises a closed bar a view already covers, the live window moves into
+    fresh arrays first and old views keep the old ones. The last row of a
+    view is the forming bar and follows its re-quotes until it closes.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.exhausted = False  # Source had fewer bars than requested
+        self._buf = self._alloc()
+        self._start = 0
+        self._end = 0
+        self._exposed = 0  # Closed rows of the current arrays below this index are visible through views
+
+    def _alloc(self) -> Dict[str, np.ndarray]:
+        size = 2 * self.capacity
+        return {f: np.empty(size, dtype=np.int64 if f == 'time' else np.float64) for f in FIELDS}
+
+    def __len__(self):
+        return self._end - self._start
+
+    def last_time(self) -> int:
+        return int(self._buf['time'][self._end - 1]) if len(self) else -1
+
+    def load(self, bars: Dict[str, np.ndarray], requested: int):
+        """Replace contents with a full history fetch"""
+        n = min(len(bars['time']), self.capacity)
+        self._buf = self._alloc()
+        for f in FIELDS:
+            self._buf[f][:n] = bars[f][-n:] if n else bars[f][:0]
+        self._start, self._end, self._exposed = 0, n, 0
+        self.exhausted = len(bars['time']) < requested
+
+    def merge(self, bars: Dict[str, np.ndarray]) -> bool:
+        """
+        Merge a short tail fetch: bars already held are overwritten in place
+        (the forming bar), newer ones appended. Returns False when the tail
+        does not overlap the buffer (a gap), meaning a full reload is needed.
+        """
+        t = bars['time']
+        k = len(t)
+        if k == 0:
+            return True
+        if not len(self) or k > self.capacity:
+            return False
+
+        held = self._buf['time'][self._start:self._end]
+        pos = int(np.searchsorted(held, t[0]))
+        if pos == len(held) or held[pos] != t[0]:
+            return False
+
+        overlap = min(len(held) - pos, k)
+        at = self._start + pos
+        exposed = min(max(self._exposed - at, 0), overlap)
+        if exposed and not all(np.array_equal(self._buf[f][at:at + exposed], bars[f][:exposed]) for f in FIELDS):
+            self._compact()  # Copy on write, handed-out views keep the old rows
+            at = self._start + pos
+        for f in FIELDS:
+            self._buf[f][at:at + overlap] = bars[f][:overlap]
+
+        new = k - overlap
+        if new:
+            if self._end + new > 2 * self.capacity:
+                self._compact()
+            for f in FIELDS:
+                self._buf[f][self._end:self._end + new] = bars[f][overlap:]
+            self._end += new
+            if len(self) > self.capacity:
+                self._start = self._end - self.capacity
+        return True
+
+    def _compact(self):
+        """Move the live window to the front of freshly allocated arrays"""
+        n = min(len(self), self.capacity)
+        old, s = self._buf, self._end - n
+        self._buf = self._alloc()
+        for f in FIELDS:
+            self._buf[f][:n] = old[f][s:self._end]
+        self._start, self._end, self._exposed = 0, n, 0
+
+    def tail(self, count: int) -> Dict[str, np.ndarray]:
+        """Read-only views over the newest `count` bars (the last one may still be re-quoted)"""
+        s = max(self._start, self._end - count)
+        out = {}
+        for f in FIELDS:
+            view = self._buf[f][s:self._end]
+            view.flags.writeable = False
+            out[f] = view
+        self._exposed = max(self._exposed, self._end - 1)
+        return out
@@ -1,21 +1,36 @@
 """
 EXECUTION ENGINE
 - Order management
-- Position tracking  
+- Position tracking (NumPy column book, vectorised mark-to-market)
 - Paper trading simulation
+- Filled paper orders journaled to JSON lines in batches
 - Real MT5 order execution
 """
 import MetaTrader5 as mt5
 import numpy as np
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 import logging
-import json
+import os
+import time
+import atexit
+from threading import Lock, RLock, Timer
+import orjson
+from app.services._njit import njit, NUMBA_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
+_U64 = (1 << 64) - 1
+JOURNAL_FLUSH_ORDERS = 64  # Write the order journal every this many fills...
+JOURNAL_FLUSH_SECONDS = 5.0  # ...or by a timer this long after the first pending fill
+
+
+def _ns_to_datetime(ns: int) -> Optional[datetime]:
+    """Local datetime for a time.time_ns() stamp; 0 means unset"""
+    return datetime.fromtimestamp(ns / 1e9) if ns else None
+
 class OrderType(Enum):
     MARKET_BUY = "MARKET_BUY"
     MARKET_SELL = "MARKET_SELL"
@@ -31,7 +46,7 @@ class OrderStatus(Enum):
     CANCELLED = "CANCELLED"
     REJECTED = "REJECTED"
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     id: str
     symbol: str
@@ -44,27 +59,35 @@ class Order:
     status: OrderStatus
     filled_price: Optional[float] = None
     filled_quantity: float = 0.0
-    created_at: datetime = None
-    filled_at: Optional[datetime] = None
+    created_at_ns: int = 0  # time.time_ns(); datetimes are built only when read
+    filled_at_ns: int = 0
     pnl: float = 0.0
     
+    @property
+    def created_at(self) -> Optional[datetime]:
+        return _ns_to_datetime(self.created_at_ns)
+    
+    @property
+    def filled_at(self) -> Optional[datetime]:
+        return _ns_to_datetime(self.filled_at_ns)
+    
     def to_dict(self):
         return {
             'id': self.id,
             'symbol': self.symbol,
-            'order_type': self.order_type.value,
+            'order_type': self.order_type._value_,  # Plain attribute, skips Enum.value's descriptor
             'side': self.side,
             'quantity': self.quantity,
             'price': self.price,
             'stop_loss': self.stop_loss,
             'take_profit': self.take_profit,
-            'status': self.status.value,
+            'status': self.status._value_,
             'filled_price': self.filled_price,
             'pnl': self.pnl,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     symbol: str
     side: str
@@ -75,7 +98,11 @@ class Position:
     take_profit: float
     unrealized_pnl: float
     realized_pnl: float
-    opened_at: datetime
+    opened_at_ns: int
+    
+    @property
+    def opened_at(self) -> Optional[datetime]:
+        return _ns_to_datetime(self.opened_at_ns)
     
     def to_dict(self):
         return {
@@ -90,23 +117,195 @@ class Position:
             'realized_pnl': self.realized_pnl
         }
 
+@njit(cache=True, nogil=True)
+def _mark_kernel(side, entry, qty, sl, tp, current, prices, pnl, hit):
+    """
+    One pass over the position rows: take each new price (NaN keeps the
+    old one), write unrealized P&L and the SL/TP hit flag. Returns the
+    unrealized total of rows that stay open. No fastmath, NaN marks unpriced.
+    """
+    total = 0.0
+    for i in range(side.shape[0]):
+        p = prices[i]
+        priced = p == p
+        if priced:
+            current[i] = p
+        c = current[i]
+        pnl[i] = side[i] * (c - entry[i]) * qty[i]
+        # Signed by side, SL/TP hits are the same test for longs and shorts
+        hit[i] = priced and (side[i] * (c - sl[i]) <= 0.0 or side[i] * (c - tp[i]) >= 0.0)
+        if not hit[i]:
+            total += pnl[i]
+    return total
+
+
+def _mark_numpy(side, entry, qty, sl, tp, current, prices, pnl, hit):
+    """_mark_kernel as array ops, for when numba is missing"""
+    priced = ~np.isnan(prices)
+    np.copyto(current, prices, where=priced)
+    np.multiply(side * (current - entry), qty, out=pnl)
+    np.logical_and(priced, (side * (current - sl) <= 0) | (side * (current - tp) >= 0), out=hit)
+    return float(pnl.sum(where=~hit))
+
+
+if NUMBA_AVAILABLE:
+    _mark = _mark_kernel
+    _mark(np.ones(1, dtype=np.int8), *(np.ones(1) for _ in range(5)), np.full(1, np.nan),
+          np.empty(1), np.empty(1, dtype=np.bool_))  # Compile (or load from cache) at import
+else:
+    _mark = _mark_numpy
+
+
+class PositionBook:
+    """
+    Open positions as parallel NumPy columns (structure of arrays) plus a
+    symbol -> row index, so marking every position to market is a handful
+    of array ops. Rows stay dense and in opening order. Reads return
+    Position snapshots; only the book mutates rows, and one lock covers
+    reads and writes so a snapshot never mixes rows.
+    """
+    
+    _COLUMNS = ('quantity', 'entry_price', 'current_price', 'stop_loss', 'take_profit',
+                'unrealized_pnl', 'realized_pnl')
+    _ALL_COLUMNS = ('side', 'opened_at_ns') + _COLUMNS
+    
+    def __init__(self, capacity: int = 16):
+        self._rows: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._lock = RLock()
+        self.side = np.zeros(capacity, dtype=np.int8)  # 1 BUY, -1 SELL
+        self.opened_at_ns = np.zeros(capacity, dtype=np.int64)
+        for col in self._COLUMNS:
+            setattr(self, col, np.zeros(capacity))
+    
+    def __len__(self):
+        return len(self._symbols)
+    
+    def __contains__(self, symbol) -> bool:
+        return symbol in self._rows
+    
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._symbols))
+    
+    def __getitem__(self, symbol: str) -> Position:
+        with self._lock:
+            return self._position(symbol)
+    
+    def _position(self, symbol: str) -> Position:
+        i = self._rows[symbol]
+        return Position(
+            symbol=symbol,
+            side="BUY" if self.side[i] > 0 else "SELL",
+            quantity=float(self.quantity[i]),
+            entry_price=float(self.entry_price[i]),
+            current_price=float(self.current_price[i]),
+            stop_loss=float(self.stop_loss[i]),
+            take_profit=float(self.take_profit[i]),
+            unrealized_pnl=float(self.unrealized_pnl[i]),
+            realized_pnl=float(self.realized_pnl[i]),
+            opened_at_ns=int(self.opened_at_ns[i])
+        )
+    
+    def values(self) -> List[Position]:
+        with self._lock:
+            return [self._position(symbol) for symbol in self._symbols]
+    
+    def open(self, symbol: str, side: str, quantity: float, price: float, stop_loss: float, take_profit: float):
+        """Add a position, or average into the existing one for the symbol"""
+        with self._lock:
+            self._open(symbol, side, quantity, price, stop_loss, take_profit)
+    
+    def _open(self, symbol: str, side: str, quantity: float, price: float, stop_loss: float, take_profit: float):
+        i = self._rows.get(symbol)
+        if i is not None:
+            held = self.quantity[i]
+            total = held + quantity
+            # Quantity-weighted average entry
+            self.entry_price[i] = (self.entry_price[i] * held + price * quantity) / total
+            self.quantity[i] = total
+            return
+        i = len(self._symbols)
+        if i == len(self.side):
+            self._grow()
+        self._rows[symbol] = i
+        self._symbols.append(symbol)
+        self.side[i] = 1 if side == "BUY" else -1
+        self.opened_at_ns[i] = time.time_ns()
+        self.quantity[i] = quantity
+        self.entry_price[i] = self.current_price[i] = price
+        self.stop_loss[i] = stop_loss
+        self.take_profit[i] = take_profit
+        self.unrealized_pnl[i] = self.realized_pnl[i] = 0.0
+    
+    def remove(self, symbol: str) -> Optional[Position]:
+        """Drop a position and return its last snapshot, or None if it is not open"""
+        with self._lock:
+            if symbol not in self._rows:
+                return None
+            pos = self._position(symbol)
+            i = self._rows.pop(symbol)
+            n = len(self._symbols)
+            for col in self._ALL_COLUMNS:
+                arr = getattr(self, col)
+                arr[i:n - 1] = arr[i + 1:n]
+            del self._symbols[i]
+            for j in range(i, n - 1):
+                self._rows[self._symbols[j]] = j
+            return pos
+    
+    def _grow(self):
+        for col in self._ALL_COLUMNS:
+            old = getattr(self, col)
+            new = np.zeros(2 * len(old), dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, col, new)
+    
+    def mark(self, prices: Dict[str, float]) -> Tuple[float, List[Tuple[str, float]]]:
+        """
+        Revalue every position against `prices` (symbols missing from it
+        keep their last price). Returns the unrealized P&L of positions that
+        stay open, and (symbol, price) for those that hit SL or TP.
+        """
+        with self._lock:
+            n = len(self._symbols)
+            if not n:
+                return 0.0, []
+            px = np.fromiter((prices.get(s, np.nan) for s in self._symbols), dtype=np.float64, count=n)
+            hit = np.empty(n, dtype=np.bool_)
+            current = self.current_price[:n]
+            total = _mark(self.side[:n], self.entry_price[:n], self.quantity[:n], self.stop_loss[:n],
+                          self.take_profit[:n], current, px, self.unrealized_pnl[:n], hit)
+            return float(total), [(self._symbols[i], float(current[i])) for i in np.flatnonzero(hit)]
+
 class ExecutionEngine:
     """
     Handles order execution and position management.
     Supports both paper trading and live MT5 execution.
     """
     
-    def __init__(self, paper_trading: bool = True):
+    def __init__(self, paper_trading: bool = True, journal_path: Optional[str] = None):
         self.paper_trading = paper_trading
         self.orders: Dict[str, Order] = {}
-        self.positions: Dict[str, Position] = {}
+        self.positions = PositionBook()
         self.trade_history: List[Order] = []
         self.order_counter = 0
+        self._id_prefix = ""
+        self._id_prefix_epoch = -1  # Second the cached id timestamp was formatted for
+        self._rng_state = (time.time_ns() ^ 0x9E3779B97F4A7C15) & _U64 or 1  # xorshift64 state, never 0
         
         # Paper trading account
         self.paper_balance = 10000.0
         self.paper_equity = 10000.0
         
+        # Filled paper orders waiting for one batched append to journal_path (None = no journal)
+        self.journal_path = journal_path
+        self._pending: List[Order] = []
+        self._flush_timer: Optional[Timer] = None
+        self._journal_lock = Lock()
+        if journal_path:
+            atexit.register(self.flush)
+        
         # MT5 connection
         self.mt5_connected = False
         if not paper_trading:
@@ -122,10 +321,24 @@ class ExecutionEngine:
             logger.warning(f"MT5 init failed: {e}")
             self.mt5_connected = False
     
+    def _slippage_sign(self) -> float:
+        """+1.0 or -1.0 from one xorshift64 step (top bit), cheaper than numpy's generator for a single bit"""
+        x = self._rng_state
+        x ^= (x << 13) & _U64
+        x ^= x >> 7
+        x ^= (x << 17) & _U64
+        self._rng_state = x
+        return 1.0 - ((x >> 63) << 1)
+    
     def _generate_order_id(self) -> str:
         """Generate unique order ID"""
+        now = int(time.time())
+        if now != self._id_prefix_epoch:
+            # strftime only once per second; ids within a second differ by the counter
+            self._id_prefix = time.strftime('%Y%m%d%H%M%S', time.localtime(now))
+            self._id_prefix_epoch = now
         self.order_counter += 1
-        return f"ORD_{datetime.now().strftime('%Y%m%d%H%M%S')}_{self.order_counter}"
+        return f"ORD_{self._id_prefix}_{self.order_counter}"
     
     def place_order(
         self,
@@ -153,7 +366,7 @@ class ExecutionEngine:
             stop_loss=stop_loss,
             take_profit=take_profit,
             status=OrderStatus.PENDING,
-            created_at=datetime.now()
+            created_at_ns=time.time_ns()
         )
         
         self.orders[order_id] = order
@@ -168,38 +381,52 @@ class ExecutionEngine:
     def _execute_paper_order(self, order: Order):
         """Execute order in paper trading mode"""
         # Simulate fill with slight slippage
-        slippage = order.price * 0.0001 * np.random.choice([-1, 1])
+        slippage = order.price * 0.0001 * self._slippage_sign()
         fill_price = order.price + slippage
         
         order.status = OrderStatus.FILLED
         order.filled_price = fill_price
         order.filled_quantity = order.quantity
-        order.filled_at = datetime.now()
+        order.filled_at_ns = time.time_ns()
         
         # Create or update position
-        if order.symbol in self.positions:
-            # Add to existing position
-            pos = self.positions[order.symbol]
-            pos.quantity += order.quantity
-            pos.entry_price = (pos.entry_price + fill_price) / 2  # Average
-        else:
-            # New position
-            self.positions[order.symbol] = Position(
-                symbol=order.symbol,
-                side=order.side,
-                quantity=order.quantity,
-                entry_price=fill_price,
-                current_price=fill_price,
-                stop_loss=order.stop_loss,
-                take_profit=order.take_profit,
-                unrealized_pnl=0.0,
-                realized_pnl=0.0,
-                opened_at=datetime.now()
-            )
+        self.positions.open(order.symbol, order.side, order.quantity, fill_price,
+                            order.stop_loss, order.take_profit)
         
         self.trade_history.append(order)
+        self._journal(order)
         logger.info(f"Paper order filled: {order.id} @ {fill_price}")
     
+    def _journal(self, order: Order):
+        """Queue a filled order; the journal is written once per batch, not per fill"""
+        if not self.journal_path:
+            return
+        with self._journal_lock:
+            if not self._pending:
+                # Deadline for this batch, so a quiet spell still gets written
+                self._flush_timer = Timer(JOURNAL_FLUSH_SECONDS, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            self._pending.append(order)
+            due = len(self._pending) >= JOURNAL_FLUSH_ORDERS
+        if due:
+            self.flush()
+    
+    def flush(self):
+        """Append pending orders to the journal in one write (also run at exit)"""
+        with self._journal_lock:
+            batch, self._pending = self._pending, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not batch:
+                return
+            try:
+                with open(self.journal_path, 'ab') as f:
+                    f.write(b''.join(orjson.dumps(order.to_dict()) + b'\n' for order in batch))
+            except OSError as e:
+                logger.error(f"Order journal write failed: {e}")
+    
     def _execute_mt5_order(self, order: Order):
         """Execute order on MT5"""
         if not self.mt5_connected:
@@ -230,7 +457,7 @@ class ExecutionEngine:
                 order.status = OrderStatus.FILLED
                 order.filled_price = result.price
                 order.filled_quantity = order.quantity
-                order.filled_at = datetime.now()
+                order.filled_at_ns = time.time_ns()
                 logger.info(f"MT5 order filled: {order.id}")
             else:
                 order.status = OrderStatus.REJECTED
@@ -242,11 +469,11 @@ class ExecutionEngine:
     
     def close_position(self, symbol: str, current_price: float) -> Optional[float]:
         """Close a position and return realized PnL"""
-        if symbol not in self.positions:
+        # Remove first, so a concurrent close of the same symbol sees nothing
+        pos = self.positions.remove(symbol)
+        if pos is None:
             return None
         
-        pos = self.positions[symbol]
-        
         # Calculate PnL
         if pos.side == "BUY":
             pnl = (current_price - pos.entry_price) * pos.quantity
@@ -258,34 +485,14 @@ class ExecutionEngine:
             self.paper_balance += pnl
             self.paper_equity = self.paper_balance
         
-        # Remove position
-        del self.positions[symbol]
-        
         logger.info(f"Position closed: {symbol}, PnL: {pnl:.2f}")
         return pnl
     
     def update_positions(self, prices: Dict[str, float]):
         """Update all positions with current prices"""
-        total_unrealized = 0.0
-        
-        for symbol, pos in self.positions.items():
-            if symbol in prices:
-                pos.current_price = prices[symbol]
-                
-                if pos.side == "BUY":
-                    pos.unrealized_pnl = (pos.current_price - pos.entry_price) * pos.quantity
-                else:
-                    pos.unrealized_pnl = (pos.entry_price - pos.current_price) * pos.quantity
-                
-                total_unrealized += pos.unrealized_pnl
-                
-                # Check stop loss / take profit
-                if pos.side == "BUY":
-                    if pos.current_price <= pos.stop_loss or pos.current_price >= pos.take_profit:
-                        self.close_position(symbol, pos.current_price)
-                else:
-                    if pos.current_price >= pos.stop_loss or pos.current_price <= pos.take_profit:
-                        self.close_position(symbol, pos.current_price)
+        total_unrealized, hits = self.positions.mark(prices)
+        for symbol, price in hits:
+            self.close_position(symbol, price)
         
         self.paper_equity = self.paper_balance + total_unrealized
     
@@ -309,4 +516,4 @@ class ExecutionEngine:
         return [order.to_dict() for order in self.trade_history[-50:]]
 
 # Singleton
-execution_engine = ExecutionEngine(paper_trading=True)
+execution_engine = ExecutionEngine(paper_trading=True, journal_path=os.environ.get('ORDER_JOURNAL_PATH'))
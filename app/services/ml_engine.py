@@ -4,9 +4,26 @@ import pandas as pd
 from typing import Dict, Optional, List
 import os
 import json
+from app.services._njit import njit
 
 logger = logging.getLogger(__name__)
 
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _prob_kernel(hour, vol):
+    """Session/volatility heuristic probability from a 0.5 baseline, clipped to [0.05, 0.95]"""
+    prob = 0.5
+    if 8.0 <= hour <= 18.0:  # Extended London/NY session
+        prob += 0.1
+    if 0.3 < vol < 3.0:  # Wider healthy volatility range
+        prob += 0.1
+    elif vol > 5.0:  # Extreme volatility protection
+        prob -= 0.1
+    return min(0.95, max(0.05, prob))
+
+
+_prob_kernel(12.0, 1.0)  # Compile (or load from cache) at import, not inside the first scan
+
 class MLEngine:
     """
     ML ENGINE - Asset Growth & Probability Layer
@@ -30,21 +47,8 @@ class MLEngine:
         In Phase 10, this will transition from heuristic-based to model-based.
         """
         # Placeholder: Intelligent Heuristic for now, replaced by model.predict() after train.py runs
-        # We factor in: Time of day, volatility, and trend strength
-        
-        # Example Logic: Boost probability if we are in core trading hours
-        hour = features.get('hour', 0)
-        if 8 <= hour <= 18: # Extended London/NY session
-            prob += 0.1
-            
-        # Factoring in volatility (Normalized ATR)
-        vol = features.get('volatility', 0)
-        if 0.3 < vol < 3.0: # Wider healthy volatility range
-            prob += 0.1
-        elif vol > 5.0: # Extreme volatility protection
-            prob -= 0.1
-            
-        return min(0.95, max(0.05, prob))
+        # We factor in: Time of day and volatility (normalized ATR)
+        return _prob_kernel(float(features.get('hour', 0)), float(features.get('volatility', 0)))
 
     def calculate_compounding_lot(self, base_lot: float, equity: float, drawdown: float) -> float:
         """
@@ -62,5 +66,14 @@ class MLEngine:
             
         return round(base_lot * growth_factor, 2)
 
+    def calculate_compounding_lots(self, base_lots, equities, drawdowns) -> np.ndarray:
+        """calculate_compounding_lot over arrays, for sizing many symbols in one call"""
+        base_lots = np.asarray(base_lots, dtype=np.float64)
+        equities = np.asarray(equities, dtype=np.float64)
+        drawdowns = np.asarray(drawdowns, dtype=np.float64)
+        growth = np.where(equities > 10000, np.sqrt(np.maximum(equities, 10000) / 10000), 1.0)
+        growth = np.where(drawdowns > 2.0, growth * (1 - drawdowns / 100), growth)
+        return np.round(base_lots * growth, 2)
+
 # Singleton
 ml_engine = MLEngine()
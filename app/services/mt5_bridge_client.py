@@ -2,15 +2,24 @@
 MT5 BRIDGE CLIENT
 Fallback data source when direct MT5 Python library fails.
 Fetches real-time data from the running mt5-bridge Flask server.
+Multi-symbol tick reads fan out over the pooled session concurrently.
+Startup only probes the port; /status is checked on the first real request.
 """
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+import socket
+from threading import Lock
+from urllib.parse import urlparse
+import numpy as np
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BridgeTick:
     symbol: str
     bid: float
@@ -19,15 +28,6 @@ class BridgeTick:
     volume: int
     time: int
 
-@dataclass
-class BridgeCandle:
-    time: int
-    open: float
-    high: float
-    low: float
-    close: float
-    volume: int
-
 class MT5BridgeClient:
     """
     HTTP client for the mt5-bridge Flask server.
@@ -37,29 +37,57 @@ class MT5BridgeClient:
     def __init__(self, base_url: str = "http://127.0.0.1:5001"):
         self.base_url = base_url
         self.connected = False
+        # Keep-alive pool sized for realtime_service's concurrent per-symbol fetches
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=0))
+        self._status_url = f"{base_url}/status"
+        self._tick_url = f"{base_url}/tick/"
+        self._candles_url = f"{base_url}/candles/"
+        self._account_url = f"{base_url}/account"
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='bridge')
+        parsed = urlparse(base_url)
+        self._host = parsed.hostname or '127.0.0.1'
+        self._port = parsed.port or 80
+        self._verify_lock = Lock()
         self._check_connection()
     
     def _check_connection(self):
-        """Verify the bridge server is running"""
+        """Cheap liveness probe: is anything listening on the bridge port"""
+        self._verified = False  # Re-confirm /status on the next request
         try:
-            response = requests.get(f"{self.base_url}/status", timeout=2)
-            if response.status_code == 200:
+            with socket.create_connection((self._host, self._port), timeout=0.2):
                 self.connected = True
-                logger.info(f"MT5 Bridge connected at {self.base_url}")
-            else:
-                self.connected = False
-        except Exception as e:
+        except OSError as e:
             self.connected = False
             logger.warning(f"MT5 Bridge not available: {e}")
     
+    def is_live(self) -> bool:
+        """Connected, with /status confirmed once before the first real request"""
+        if not self.connected:
+            return False
+        if self._verified:
+            return True
+        with self._verify_lock:
+            if not self._verified:
+                try:
+                    response = self.session.get(self._status_url, timeout=2)
+                    self.connected = response.status_code == 200
+                except Exception as e:
+                    self.connected = False
+                    logger.warning(f"MT5 Bridge not available: {e}")
+                if self.connected:
+                    logger.info(f"MT5 Bridge connected at {self.base_url}")
+                self._verified = True
+        return self.connected
+    
     def get_tick(self, symbol: str) -> Optional[BridgeTick]:
         """Get latest tick from bridge"""
-        if not self.connected:
+        if not self.is_live():
             return None
         try:
-            response = requests.get(f"{self.base_url}/tick/{symbol}", timeout=2)
+            response = self.session.get(self._tick_url + symbol, timeout=2)
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 return BridgeTick(
                     symbol=symbol,
                     bid=data.get('bid', 0),
@@ -72,40 +100,45 @@ class MT5BridgeClient:
             logger.error(f"Bridge tick error: {e}")
         return None
     
-    def get_candles(self, symbol: str, timeframe: str, count: int = 500) -> List[BridgeCandle]:
-        """Get historical candles from bridge"""
-        if not self.connected:
-            return []
+    def get_ticks(self, symbols: List[str]) -> Dict[str, BridgeTick]:
+        """Latest ticks for several symbols, requested concurrently (about one round trip in total)"""
+        if not symbols or not self.is_live():
+            return {}
+        ticks = self._pool.map(self.get_tick, symbols) if len(symbols) > 1 else [self.get_tick(symbols[0])]
+        return {s: t for s, t in zip(symbols, ticks) if t}
+    
+    def get_candles(self, symbol: str, timeframe: str, count: int = 500) -> Optional[Dict[str, np.ndarray]]:
+        """Historical candles from the bridge as column arrays (time, open, high, low, close, volume)"""
+        if not self.is_live():
+            return None
         try:
-            response = requests.get(
-                f"{self.base_url}/candles/{symbol}/{timeframe}/{count}",
-                timeout=10
-            )
+            response = self.session.get(f"{self._candles_url}{symbol}/{timeframe}/{count}", timeout=10)
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 candles = data.get('candles', data) if isinstance(data, dict) else data
-                return [
-                    BridgeCandle(
-                        time=c.get('time', 0),
-                        open=c.get('open', 0),
-                        high=c.get('high', 0),
-                        low=c.get('low', 0),
-                        close=c.get('close', 0),
-                        volume=c.get('tick_volume', c.get('volume', 0))
-                    ) for c in candles
-                ]
+                if not candles:
+                    return None
+                n = len(candles)
+                bars = {
+                    f: np.fromiter((c.get(f, 0) for c in candles), dtype=np.int64 if f == 'time' else np.float64, count=n)
+                    for f in ('time', 'open', 'high', 'low', 'close')
+                }
+                bars['volume'] = np.fromiter(
+                    (c.get('tick_volume', c.get('volume', 0)) for c in candles), dtype=np.float64, count=n
+                )
+                return bars
         except Exception as e:
             logger.error(f"Bridge candles error: {e}")
-        return []
+        return None
     
     def get_account(self) -> Dict:
         """Get account info from bridge"""
-        if not self.connected:
+        if not self.is_live():
             return {}
         try:
-            response = requests.get(f"{self.base_url}/account", timeout=2)
+            response = self.session.get(self._account_url, timeout=2)
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
         except Exception as e:
             logger.error(f"Bridge account error: {e}")
         return {}
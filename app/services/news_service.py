@@ -2,16 +2,39 @@
 NEWS SERVICE - Economic Calendar & High Impact Event Filter
 Ported from backend/src/services/news.service.ts
 Uses ForexFactory JSON feed for event detection.
+High-impact events are indexed per currency on refresh, and per symbol
+(its base, quote and USD merged into one sorted epoch array) on first
+use, so the per-scan window check is a pair of binary searches.
 """
 import requests
 import logging
+import time
+import numpy as np
+import orjson
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+NEWS_AFTER_SECONDS = 15 * 60  # Trading stays halted this long after a high-impact release
+MAX_INDEXED_SYMBOLS = 256  # Symbols can come from request URLs, keep the per-symbol index bounded
+
+
+@lru_cache(maxsize=1024)
+def _event_timestamp(date: str) -> int:
+    """Epoch seconds of a feed date; the weekly feed repeats the same strings every refresh"""
+    return int(datetime.fromisoformat(date.replace('Z', '+00:00')).timestamp())
+
+@lru_cache(maxsize=256)
+def _symbol_currencies(symbol: str) -> frozenset:
+    """Currencies whose high-impact news halts `symbol`: its base, its quote and USD"""
+    base = symbol[:3].upper()
+    quote = symbol[3:6].upper() if len(symbol) >= 6 else ""
+    return frozenset({base, quote, "USD"} - {""})
+
+@dataclass(slots=True)
 class CalendarEvent:
     title: str
     country: str
@@ -19,6 +42,7 @@ class CalendarEvent:
     impact: str
     forecast: str
     previous: str
+    timestamp: int  # Epoch seconds of `date`
 
 class NewsService:
     """
@@ -30,6 +54,14 @@ class NewsService:
         self.cache: List[CalendarEvent] = []
         self.cache_expires: Optional[datetime] = None
         self.cache_ttl_minutes = 5
+        # Whole parsed week plus its validators; a 304 on refresh reuses it without download or parse
+        self.session = requests.Session()
+        self._week: List[CalendarEvent] = []
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        # (country -> [(epoch, title)], symbol -> (sorted epochs, [(epoch, title, country)])), High impact only.
+        # One tuple so a refresh swaps both halves at once
+        self._index: Tuple[Dict[str, list], Dict[str, tuple]] = ({}, {})
     
     def _fetch_events(self) -> List[CalendarEvent]:
         """Fetch this week's calendar from ForexFactory"""
@@ -39,79 +71,105 @@ class NewsService:
         
         try:
             logger.info("📰 Fetching news from ForexFactory...")
-            response = requests.get(self.calendar_url, timeout=10)
-            if response.status_code == 200:
-                events = response.json()
-                now = datetime.now()
-                
-                # Filter for events within ±24 hours
-                filtered = []
-                for e in events:
-                    try:
-                        event_date = datetime.fromisoformat(e.get('date', '').replace('Z', '+00:00'))
-                        if abs((event_date - now).total_seconds()) < 24 * 3600:
-                            filtered.append(CalendarEvent(
-                                title=e.get('title', ''),
-                                country=e.get('country', ''),
-                                date=e.get('date', ''),
-                                impact=e.get('impact', 'Low'),
-                                forecast=e.get('forecast', ''),
-                                previous=e.get('previous', '')
-                            ))
-                    except:
-                        pass
-                
-                self.cache = filtered
-                self.cache_expires = datetime.now() + timedelta(minutes=self.cache_ttl_minutes)
-                logger.info(f"Loaded {len(filtered)} upcoming news events")
-                return filtered
+            headers = {}
+            if self._etag:
+                headers['If-None-Match'] = self._etag
+            if self._last_modified:
+                headers['If-Modified-Since'] = self._last_modified
+            response = self.session.get(self.calendar_url, headers=headers, timeout=10)
+            if response.status_code == 304 and self._week:
+                logger.info("Calendar unchanged (304), reusing parsed events")
+            elif response.status_code == 200:
+                self._week = self._parse_events(orjson.loads(response.content))
+                self._etag = response.headers.get('ETag')
+                self._last_modified = response.headers.get('Last-Modified')
+            else:
+                return self.cache if self.cache else []
+            
+            # Filter for events within ±24 hours (re-applied on a 304, the window moves)
+            now = time.time()
+            filtered = [e for e in self._week if abs(e.timestamp - now) < 24 * 3600]
+            self.cache = filtered
+            self._index = (self._index_high_impact(filtered), {})
+            self.cache_expires = datetime.now() + timedelta(minutes=self.cache_ttl_minutes)
+            logger.info(f"Loaded {len(filtered)} upcoming news events")
+            return filtered
         except Exception as e:
             logger.error(f"Failed to fetch calendar: {e}")
         
         return self.cache if self.cache else []
     
+    @staticmethod
+    def _parse_events(events: list) -> List[CalendarEvent]:
+        """CalendarEvents from the raw feed rows, skipping rows without a valid date"""
+        parsed = []
+        for e in events:
+            try:
+                parsed.append(CalendarEvent(
+                    title=e.get('title', ''),
+                    country=e.get('country', ''),
+                    date=e.get('date', ''),
+                    impact=e.get('impact', 'Low'),
+                    forecast=e.get('forecast', ''),
+                    previous=e.get('previous', ''),
+                    timestamp=_event_timestamp(e.get('date', ''))
+                ))
+            except (AttributeError, TypeError, ValueError):
+                pass
+        return parsed
+    
+    @staticmethod
+    def _index_high_impact(events: List[CalendarEvent]) -> Dict[str, List[Tuple[int, str]]]:
+        """(timestamp, title) of High impact events per country"""
+        by_country: Dict[str, list] = {}
+        for event in events:
+            if event.impact == "High":
+                by_country.setdefault(event.country, []).append((event.timestamp, event.title))
+        return by_country
+    
+    def _symbol_index(self, symbol: str) -> Tuple[np.ndarray, List[Tuple[int, str, str]]]:
+        """Sorted High impact events for every currency that blocks `symbol`, built once per refresh"""
+        by_country, by_symbol = self._index
+        entry = by_symbol.get(symbol)
+        if entry is None:
+            items = sorted(
+                (ts, title, country)
+                for country in _symbol_currencies(symbol)
+                for ts, title in by_country.get(country, ())
+            )
+            entry = (np.array([item[0] for item in items], dtype=np.int64), items)
+            if len(by_symbol) < MAX_INDEXED_SYMBOLS:
+                by_symbol[symbol] = entry
+        return entry
+    
     def check_news_stop(self, symbol: str, buffer_minutes: int = 30) -> Dict:
         """
         Check if trading should be halted due to high-impact news.
         Returns: {stop: bool, reason: str, events: list}
         """
-        events = self._fetch_events()
-        now = datetime.now()
-        buffer = timedelta(minutes=buffer_minutes)
+        self._fetch_events()
+        now = time.time()
         
-        # Extract base and quote currencies
-        base = symbol[:3].upper()
-        quote = symbol[3:6].upper() if len(symbol) >= 6 else ""
+        # Block if within buffer before, or 15 mins after
+        ts, items = self._symbol_index(symbol)
+        lo = int(np.searchsorted(ts, now - NEWS_AFTER_SECONDS, side='left'))
+        hi = int(np.searchsorted(ts, now + buffer_minutes * 60, side='right'))
         
         blocking_events = []
-        
-        for event in events:
-            if event.impact != "High":
-                continue
-            
-            # Check if event affects this pair
-            if event.country not in [base, quote, "USD"]:
-                continue
-            
-            try:
-                event_time = datetime.fromisoformat(event.date.replace('Z', '+00:00'))
-                diff = event_time - now
-                
-                # Block if within buffer before, or 15 mins after
-                if timedelta(0) < diff <= buffer:
-                    blocking_events.append({
-                        "title": event.title,
-                        "country": event.country,
-                        "minutes_until": int(diff.total_seconds() / 60)
-                    })
-                elif timedelta(minutes=-15) <= diff <= timedelta(0):
-                    blocking_events.append({
-                        "title": event.title,
-                        "country": event.country,
-                        "minutes_ago": int(abs(diff.total_seconds()) / 60)
-                    })
-            except:
-                pass
+        for event_ts, title, country in items[lo:hi]:
+            diff = event_ts - now
+            if diff > 0:
+                blocking_events.append({
+                    "title": title,
+                    "country": country,
+                    "minutes_until": int(diff / 60)
+                })
+            else:
+                blocking_events.append({
+                    "title": title,
+                    "country": country,
+                    "minutes_ago": int(-diff / 60)
+                })
         
         if blocking_events:
             return {
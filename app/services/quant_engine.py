@@ -13,10 +13,136 @@ from dataclasses import dataclass
 from enum import Enum
 import logging
 import random
+from scipy.signal import lfilter
+from app.services._njit import njit, NUMBA_AVAILABLE
+from app.services._indicators_njit import last_rsi
 from app.services.settings_store import _settings
 
 logger = logging.getLogger(__name__)
 
+try:
+    import bottleneck as bn  # C moving-window kernels for the Bollinger Bands, NumPy windows otherwise
+except ImportError:
+    bn = None
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    True range for bars 1..n-1: max(H-L, |H-Cprev|, |L-Cprev|).
+    Reduced in place into one output buffer plus one scratch array.
+    """
+    prev = close[:-1]
+    tr = np.subtract(high[1:], low[1:])
+    scratch = np.subtract(high[1:], prev)
+    np.abs(scratch, out=scratch)
+    np.maximum(tr, scratch, out=tr)
+    np.subtract(low[1:], prev, out=scratch)
+    np.abs(scratch, out=scratch)
+    np.maximum(tr, scratch, out=tr)
+    return tr
+
+def _tail(a: np.ndarray, period: int) -> np.ndarray:
+    """
+    Trailing bars an endpoint read of a `period` indicator needs. EMA and
+    Wilder smoothing forget their start geometrically, so 8 periods of
+    burn-in leave the last values equal to the full-history ones to ~1e-7
+    """
+    return a[-max(period * 8, 260):]
+
+@njit(cache=True, nogil=True)
+def _wilder_smooth(values, period):
+    """
+    Wilder smoothing of per-bar changes (gains, losses, true range), aligned
+    to the n+1 bars they came from: out[period] is the mean of the first
+    `period` values, then out[i] = (out[i-1]*(period-1) + values[i-1]) / period.
+    Bars before the seed stay 0.
+    """
+    n = values.shape[0] + 1
+    out = np.zeros(n)
+    if n <= period:
+        return out
+    seed = 0.0
+    for i in range(period):
+        seed += values[i]
+    out[period] = seed / period
+    for i in range(period + 1, n):
+        out[i] = (out[i - 1] * (period - 1) + values[i - 1]) / period
+    return out
+
+@njit(cache=True, nogil=True)
+def _multi_ema_kernel(data, alphas):
+    """One pass over `data` advancing an EMA per alpha; row j is the series for alphas[j]"""
+    k = alphas.shape[0]
+    n = data.shape[0]
+    out = np.empty((k, n))
+    for j in range(k):
+        out[j, 0] = data[0]
+    for i in range(1, n):
+        x = data[i]
+        for j in range(k):
+            out[j, i] = alphas[j] * x + (1.0 - alphas[j]) * out[j, i - 1]
+    return out
+
+def _multi_ema_lfilter(data, alphas):
+    """_multi_ema_kernel as one lfilter call per alpha, for when numba is missing"""
+    out = np.empty((alphas.shape[0], data.shape[0]))
+    for j, a in enumerate(alphas):
+        out[j], _ = lfilter([a], [1.0, a - 1.0], data, zi=[(1 - a) * data[0]])
+    return out
+
+_multi_ema = _multi_ema_kernel if NUMBA_AVAILABLE else _multi_ema_lfilter
+
+_EMA_PERIODS = (12, 20, 26, 50, 200)  # MACD fast/slow plus the trend EMAs, as calculate_emas rows
+_EMA_ALPHAS = 2.0 / (np.array(_EMA_PERIODS) + 1.0)
+_MACD_SIGNAL_ALPHA = 2.0 / (9 + 1.0)
+_BAND_WINDOW = 50 + 20 - 1  # Closes behind the 50 band values detect_regime averages
+
+def _price_changes(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(gains, losses) of bar-to-bar changes, split branchlessly in two reused buffers"""
+    # gains = (d + |d|) / 2, losses = |d| - gains
+    gains = np.diff(np.asarray(data, dtype=np.float64))
+    losses = np.abs(gains)
+    gains += losses
+    gains *= 0.5
+    losses -= gains
+    return gains, losses
+
+def _band_stats(data: np.ndarray, period: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and sample std; NaN for the first period-1 bars like pandas rolling"""
+    if bn is not None:
+        middle = bn.move_mean(data, period)
+        std = bn.move_std(data, period, ddof=1)
+    else:
+        # Same output as pandas rolling(period).mean()/.std(), without building Series
+        middle = np.full(len(data), np.nan)
+        std = np.full(len(data), np.nan)
+        if len(data) >= period:
+            windows = np.lib.stride_tricks.sliding_window_view(data, period)
+            middle[period - 1:] = windows.mean(axis=1)
+            std[period - 1:] = windows.std(axis=1, ddof=1)
+    return middle, std
+
+def _bollinger_bands(data: np.ndarray, period: int = 20, std_dev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Upper, middle, lower bands"""
+    middle, std = _band_stats(data, period)
+    upper = middle + (std * std_dev)
+    lower = middle - (std * std_dev)
+    return upper, middle, lower
+
+def _regime_bands(closes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Upper and lower 20/2 bands plus their relative width (upper - lower) / middle,
+    taken straight from the std as 4 * std / middle (0 where middle is 0)
+    """
+    middle, std = _band_stats(closes, 20)
+    half = 2.0 * std
+    width = np.divide(2.0 * half, middle, out=np.zeros_like(middle), where=middle != 0)
+    return middle + half, middle - half, width
+
+def _push(ring: np.ndarray, value: float):
+    """Shift a short window left by one and append `value`"""
+    ring[:-1] = ring[1:]
+    ring[-1] = value
+
 class MarketRegime(Enum):
     TRENDING_STRONG = "TRENDING_STRONG"
     TRENDING_WEAK = "TRENDING_WEAK"  
@@ -36,6 +162,129 @@ class SignalStrength:
     risk_reward: float
     strategy: str
     reasoning: List[str]
+    regime: str = ""  # MarketRegime value the signal was scored under
+
+@dataclass(slots=True)
+class IndicatorBundle:
+    """
+    Price columns plus every indicator the regime check and the signal
+    scoring read, computed once per call. Indicators cover the recent
+    tail of the history (see _tail), VWAP the whole of it; the bands only
+    the last 50 bars the regime check averages, RSI only its last value.
+    A SymbolState fills it with just the trailing values scoring reads.
+    """
+    close: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    open: np.ndarray
+    ema_20: np.ndarray
+    ema_50: np.ndarray
+    ema_200: np.ndarray
+    rsi: float
+    macd: np.ndarray
+    macd_signal: np.ndarray
+    macd_hist: np.ndarray
+    bb_upper: np.ndarray
+    bb_lower: np.ndarray
+    bb_width: np.ndarray  # (upper - lower) / middle
+    atr: np.ndarray
+    vwap: np.ndarray
+
+@dataclass(slots=True)
+class SymbolState:
+    """
+    Running indicator state for one symbol, advanced one closed bar at a
+    time in O(1): EMA and Wilder recurrences, cumulative VWAP sums and
+    short windows for what the regime check averages. Built once from a
+    history with from_history, then fed bars through update.
+    """
+    emas: np.ndarray  # Last value per _EMA_PERIODS
+    macd_signal: float
+    macd_hist: np.ndarray  # Previous and last histogram values
+    avg_gain: float  # Wilder RSI averages
+    avg_loss: float
+    atr: np.ndarray  # Last 50 ATR values
+    closes: np.ndarray  # Last _BAND_WINDOW closes
+    opens: np.ndarray  # Last 2 bars
+    highs: np.ndarray
+    lows: np.ndarray
+    tpv: float  # Cumulative typical price * volume
+    volume: float  # Cumulative volume
+    
+    @classmethod
+    def from_history(cls, engine: 'QuantEngine', df: pd.DataFrame) -> 'SymbolState':
+        """State after the last bar of `df`, warmed with the batch indicators"""
+        close = np.asarray(df['close'].values, dtype=np.float64)
+        high = np.asarray(df['high'].values, dtype=np.float64)
+        low = np.asarray(df['low'].values, dtype=np.float64)
+        volume = np.asarray(df['volume'].values, dtype=np.float64) if 'volume' in df else np.ones_like(close)
+        recent = _tail(close, 50)
+        emas = engine.calculate_emas(_tail(close, 200), _EMA_PERIODS)
+        _, signal_line, histogram = engine._macd_from_emas(emas[0], emas[2])
+        gains, losses = _price_changes(recent)
+        atr = engine.calculate_atr(_tail(high, 50), _tail(low, 50), recent, 14)
+        return cls(
+            emas=emas[:, -1].copy(),
+            macd_signal=float(signal_line[-1]),
+            macd_hist=histogram[-2:].copy(),
+            avg_gain=float(_wilder_smooth(gains, 14)[-1]),
+            avg_loss=float(_wilder_smooth(losses, 14)[-1]),
+            atr=atr[-50:].copy(),
+            closes=close[-_BAND_WINDOW:].copy(),
+            opens=np.array(df['open'].values[-2:], dtype=np.float64),
+            highs=high[-2:].copy(),
+            lows=low[-2:].copy(),
+            tpv=float(np.dot((high + low + close) / 3, volume)),
+            volume=float(volume.sum())
+        )
+    
+    def update(self, bar: Dict[str, float]) -> IndicatorBundle:
+        """Advance every indicator by one closed bar and return the latest values"""
+        o, h, l, c = float(bar['open']), float(bar['high']), float(bar['low']), float(bar['close'])
+        v = float(bar.get('volume', 1.0))
+        prev = self.closes[-1]
+        
+        self.emas = _EMA_ALPHAS * c + (1 - _EMA_ALPHAS) * self.emas
+        macd = self.emas[0] - self.emas[2]
+        self.macd_signal = _MACD_SIGNAL_ALPHA * macd + (1 - _MACD_SIGNAL_ALPHA) * self.macd_signal
+        _push(self.macd_hist, macd - self.macd_signal)
+        
+        change = c - prev
+        self.avg_gain = (self.avg_gain * 13 + max(change, 0.0)) / 14
+        self.avg_loss = (self.avg_loss * 13 + max(-change, 0.0)) / 14
+        tr = max(h - l, abs(h - prev), abs(l - prev))
+        _push(self.atr, (self.atr[-1] * 13 + tr) / 14)
+        
+        _push(self.closes, c)
+        _push(self.opens, o)
+        _push(self.highs, h)
+        _push(self.lows, l)
+        self.tpv += (h + l + c) / 3 * v
+        self.volume += v
+        return self.bundle()
+    
+    def bundle(self) -> IndicatorBundle:
+        """Current values in the shape the regime check and scoring read"""
+        upper, lower, width = _regime_bands(self.closes)
+        macd = self.emas[0] - self.emas[2]
+        return IndicatorBundle(
+            close=self.closes[-2:].copy(),
+            high=self.highs.copy(),
+            low=self.lows.copy(),
+            open=self.opens.copy(),
+            ema_20=self.emas[1:2].copy(),
+            ema_50=self.emas[3:4].copy(),
+            ema_200=self.emas[4:5].copy(),
+            rsi=100.0 if self.avg_loss == 0 else 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss),
+            macd=np.array([macd]),
+            macd_signal=np.array([self.macd_signal]),
+            macd_hist=self.macd_hist.copy(),
+            bb_upper=upper,
+            bb_lower=lower,
+            bb_width=width,
+            atr=self.atr.copy(),
+            vwap=np.array([self.tpv / self.volume])
+        )
 
 class QuantEngine:
     """
@@ -44,34 +293,29 @@ class QuantEngine:
     """
     
     def __init__(self):
-        self.cache = {}
+        self.cache: Dict[str, SymbolState] = {}  # Streaming state per symbol
     
     # ========== TECHNICAL INDICATORS ==========
     
     def calculate_ema(self, data: np.ndarray, period: int) -> np.ndarray:
-        """Exponential Moving Average"""
+        """Exponential Moving Average (seeded with the first value)"""
         alpha = 2 / (period + 1)
-        ema = np.zeros_like(data)
-        ema[0] = data[0]
-        for i in range(1, len(data)):
-            ema[i] = alpha * data[i] + (1 - alpha) * ema[i-1]
+        data = np.asarray(data, dtype=np.float64)
+        # ema[i] = alpha * data[i] + (1 - alpha) * ema[i-1] as a first-order IIR filter;
+        # the initial state makes ema[0] == data[0]
+        ema, _ = lfilter([alpha], [1.0, alpha - 1.0], data, zi=[(1 - alpha) * data[0]])
         return ema
     
+    def calculate_emas(self, data: np.ndarray, periods: Tuple[int, ...]) -> np.ndarray:
+        """EMAs for several periods in one pass over `data`, one row per period"""
+        alphas = 2.0 / (np.asarray(periods, dtype=np.float64) + 1.0)
+        return _multi_ema(np.ascontiguousarray(data, dtype=np.float64), alphas)
+    
     def calculate_rsi(self, data: np.ndarray, period: int = 14) -> np.ndarray:
         """Relative Strength Index"""
-        deltas = np.diff(data)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.zeros(len(data))
-        avg_loss = np.zeros(len(data))
-        
-        avg_gain[period] = np.mean(gains[:period])
-        avg_loss[period] = np.mean(losses[:period])
-        
-        for i in range(period + 1, len(data)):
-            avg_gain[i] = (avg_gain[i-1] * (period - 1) + gains[i-1]) / period
-            avg_loss[i] = (avg_loss[i-1] * (period - 1) + losses[i-1]) / period
+        gains, losses = _price_changes(data)
+        avg_gain = _wilder_smooth(gains, period)
+        avg_loss = _wilder_smooth(losses, period)
         
         rs = np.where(avg_loss != 0, avg_gain / avg_loss, 100)
         rsi = 100 - (100 / (1 + rs))
@@ -79,31 +323,19 @@ class QuantEngine:
     
     def calculate_bollinger_bands(self, data: np.ndarray, period: int = 20, std_dev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Bollinger Bands - Upper, Middle, Lower"""
-        middle = pd.Series(data).rolling(window=period).mean().values
-        std = pd.Series(data).rolling(window=period).std().values
-        upper = middle + (std * std_dev)
-        lower = middle - (std * std_dev)
-        return upper, middle, lower
+        return _bollinger_bands(data, period, std_dev)
     
     def calculate_atr(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
         """Average True Range"""
-        tr = np.maximum(
-            high[1:] - low[1:],
-            np.maximum(
-                np.abs(high[1:] - close[:-1]),
-                np.abs(low[1:] - close[:-1])
-            )
-        )
-        atr = np.zeros(len(close))
-        atr[period] = np.mean(tr[:period])
-        for i in range(period + 1, len(close)):
-            atr[i] = (atr[i-1] * (period - 1) + tr[i-1]) / period
-        return atr
+        return _wilder_smooth(np.asarray(true_range(high, low, close), dtype=np.float64), period)
     
     def calculate_macd(self, data: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """MACD Line, Signal Line, Histogram"""
-        ema_fast = self.calculate_ema(data, fast)
-        ema_slow = self.calculate_ema(data, slow)
+        ema_fast, ema_slow = self.calculate_emas(data, (fast, slow))
+        return self._macd_from_emas(ema_fast, ema_slow, signal)
+    
+    def _macd_from_emas(self, ema_fast: np.ndarray, ema_slow: np.ndarray, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """MACD lines from fast/slow EMAs that are already computed"""
         macd_line = ema_fast - ema_slow
         signal_line = self.calculate_ema(macd_line, signal)
         histogram = macd_line - signal_line
@@ -111,10 +343,13 @@ class QuantEngine:
     
     def calculate_vwap(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
         """Volume Weighted Average Price"""
-        typical_price = (high + low + close) / 3
-        cumulative_tpv = np.cumsum(typical_price * volume)
-        cumulative_volume = np.cumsum(volume)
-        vwap = cumulative_tpv / cumulative_volume
+        # Typical price * volume, accumulated and divided in one buffer
+        vwap = np.add(high, low, dtype=np.float64)
+        vwap += close
+        vwap /= 3
+        vwap *= volume
+        np.cumsum(vwap, out=vwap)
+        vwap /= np.cumsum(volume)
         return vwap
     
     def calculate_fibonacci_levels(self, high: float, low: float) -> Dict[str, float]:
@@ -143,35 +378,60 @@ class QuantEngine:
             'S3': low - 2 * (high - pivot)
         }
     
+    def _build_bundle(self, df: pd.DataFrame) -> IndicatorBundle:
+        """Extract the price columns once and compute every indicator on them"""
+        close = df['close'].values
+        high = df['high'].values
+        low = df['low'].values
+        volume = df['volume'].values if 'volume' in df else np.ones_like(close)
+        # Only the last few indicator values are read, so they run on a bounded tail
+        recent = _tail(close, 50)
+        # All five EMAs on close in one pass, over the window the slowest one needs
+        ema_12, ema_20, ema_26, ema_50, ema_200 = self.calculate_emas(_tail(close, 200), _EMA_PERIODS)
+        macd_line, signal_line, histogram = self._macd_from_emas(ema_12, ema_26)
+        # Just enough bars for the 50 band values detect_regime averages over
+        upper, lower, width = _regime_bands(close[-_BAND_WINDOW:])
+        return IndicatorBundle(
+            close=close,
+            high=high,
+            low=low,
+            open=df['open'].values,
+            ema_20=ema_20,
+            ema_50=ema_50,
+            ema_200=ema_200,
+            rsi=float(last_rsi(recent, 14)),
+            macd=macd_line,
+            macd_signal=signal_line,
+            macd_hist=histogram,
+            bb_upper=upper,
+            bb_lower=lower,
+            bb_width=width,
+            atr=self.calculate_atr(_tail(high, 50), _tail(low, 50), recent, 14),
+            vwap=self.calculate_vwap(high, low, close, volume)
+        )
+    
     # ========== REGIME DETECTION ==========
     
-    def detect_regime(self, df: pd.DataFrame) -> MarketRegime:
+    def detect_regime(self, data) -> MarketRegime:
         """
         Classifies market regime using multiple factors:
         - ADX for trend strength
         - ATR expansion/contraction
         - Bollinger Band width
+        Takes the OHLC DataFrame or an IndicatorBundle already built from it.
         """
-        close = df['close'].values
-        high = df['high'].values
-        low = df['low'].values
-        
-        # EMA Slope for Trend Direction
-        ema_20 = self.calculate_ema(close, 20)
-        ema_50 = self.calculate_ema(close, 50)
+        b = data if isinstance(data, IndicatorBundle) else self._build_bundle(data)
         
         # ATR for Volatility
-        atr = self.calculate_atr(high, low, close, 14)
-        atr_current = atr[-1]
-        atr_avg = np.mean(atr[-50:])
+        atr_current = b.atr[-1]
+        atr_avg = np.mean(b.atr[-50:])
         
         # Bollinger Band Width
-        upper, middle, lower = self.calculate_bollinger_bands(close)
-        bb_width = (upper[-1] - lower[-1]) / middle[-1] if middle[-1] != 0 else 0
-        bb_avg_width = np.mean((upper[-50:] - lower[-50:]) / middle[-50:])
+        bb_width = b.bb_width[-1]
+        bb_avg_width = b.bb_width[-50:].mean()
         
         # Trend Strength
-        ema_diff = (ema_20[-1] - ema_50[-1]) / close[-1] * 100
+        ema_diff = (b.ema_20[-1] - b.ema_50[-1]) / b.close[-1] * 100
         
         # Classification Logic
         if atr_current > atr_avg * 1.2 and bb_width > bb_avg_width * 1.1:
@@ -196,16 +456,33 @@ class QuantEngine:
             logger.warning(f"Insufficient data for {symbol}")
             return None
         
-        close = df['close'].values
-        high = df['high'].values
-        low = df['low'].values
-        open_p = df['open'].values
+        # Every indicator is computed once and shared by the regime check and the scoring
+        return self._score(self._build_bundle(df), symbol)
+    
+    def generate_signal_streaming(self, symbol: str, bar: Dict[str, float],
+                                  history: Optional[pd.DataFrame] = None) -> Optional[SignalStrength]:
+        """
+        generate_signal for a live feed: advances the symbol's SymbolState by
+        one closed bar instead of recomputing the history. The first call
+        needs `history` (the bars before `bar`) to warm the state.
+        """
+        state = self.cache.get(symbol)
+        if state is None:
+            if history is None or len(history) < 100:
+                logger.warning(f"Insufficient data for {symbol}")
+                return None
+            state = self.cache[symbol] = SymbolState.from_history(self, history)
+        return self._score(state.update(bar), symbol)
+    
+    def _score(self, b: IndicatorBundle, symbol: str) -> Optional[SignalStrength]:
+        """Ensemble scoring and risk levels from precomputed indicators"""
+        close, high, low, open_p = b.close, b.high, b.low, b.open
         
         current_price = close[-1]
         reasoning = []
         
         # 0. Market Regime Check
-        regime = self.detect_regime(df)
+        regime = self.detect_regime(b)
         reasoning.append(f"Regime: {regime.value}")
         
         # Guard: Filter based on regime
@@ -222,9 +499,7 @@ class QuantEngine:
         logger.info(f"   [QUANT] Base Logic: Regime={regime.value}, MinScore={min_score_threshold}")
 
         # 1. Trend Analysis
-        ema_20 = self.calculate_ema(close, 20)
-        ema_50 = self.calculate_ema(close, 50)
-        ema_200 = self.calculate_ema(close, 200)
+        ema_20, ema_50, ema_200 = b.ema_20, b.ema_50, b.ema_200
         
         trend_score = 0
         if ema_20[-1] > ema_50[-1] > ema_200[-1]:
@@ -235,8 +510,7 @@ class QuantEngine:
             reasoning.append("✓ Strong Downtrend (EMA 20 < 50 < 200)")
         
         # 2. VWAP & Volume confirmation
-        volume = df['volume'].values if 'volume' in df else np.ones_like(close)
-        vwap = self.calculate_vwap(high, low, close, volume)
+        vwap = b.vwap
         
         volume_score = 0
         if current_price > vwap[-1]:
@@ -247,8 +521,7 @@ class QuantEngine:
             reasoning.append("✓ Price below VWAP (Bearish Bias)")
 
         # 3. RSI Analysis
-        rsi = self.calculate_rsi(close, 14)
-        rsi_current = rsi[-1]
+        rsi_current = b.rsi
         
         rsi_score = 0
         if rsi_current < 30:
@@ -259,7 +532,7 @@ class QuantEngine:
             reasoning.append(f"✓ RSI Overbought ({rsi_current:.1f})")
         
         # 4. MACD Analysis
-        macd_line, signal_line, histogram = self.calculate_macd(close)
+        macd_line, signal_line, histogram = b.macd, b.macd_signal, b.macd_hist
         
         macd_score = 0
         if macd_line[-1] > signal_line[-1] and histogram[-1] > histogram[-2]:
@@ -270,8 +543,7 @@ class QuantEngine:
             reasoning.append("✓ MACD Bearish Crossover")
         
         # 5. Bollinger Band Analysis
-        upper, middle, lower = self.calculate_bollinger_bands(close)
-        
+        upper, lower = b.bb_upper, b.bb_lower
         bb_score = 0
         if current_price < lower[-1]:
             bb_score = 1
@@ -281,34 +553,30 @@ class QuantEngine:
             reasoning.append("✓ Price above Upper BB (Mean Reversion Sell)")
         
         # 6. Candlestick Pattern Recognition
-        pattern_score = 0
-        
-        # Bullish Engulfing
-        if close[-1] > open_p[-1] and close[-2] < open_p[-2] and close[-1] > open_p[-2] and open_p[-1] < close[-2]:
-            pattern_score += 3
+        # Last two bars read once into Python floats; each pattern is one boolean expression
+        o1, c1, h1, l1 = float(open_p[-1]), float(close[-1]), float(high[-1]), float(low[-1])
+        o2, c2 = float(open_p[-2]), float(close[-2])
+        body = abs(c1 - o1)
+        wick_lower = min(c1, o1) - l1
+        wick_upper = h1 - max(c1, o1)
+        
+        bullish_engulfing = (c1 > o1) & (c2 < o2) & (c1 > o2) & (o1 < c2)
+        bearish_engulfing = (c1 < o1) & (c2 > o2) & (c1 < o2) & (o1 > c2)
+        hammer = (wick_lower > 2 * body) & (wick_upper < body)  # Pinbar (Bullish)
+        shooting_star = (wick_upper > 2 * body) & (wick_lower < body)  # Bearish
+        pattern_score = 3 * bullish_engulfing - 3 * bearish_engulfing + hammer - shooting_star
+        
+        if bullish_engulfing:
             reasoning.append("✓ Bullish Engulfing Pattern")
-            
-        # Bearish Engulfing
-        if close[-1] < open_p[-1] and close[-2] > open_p[-2] and close[-1] < open_p[-2] and open_p[-1] > close[-2]:
-            pattern_score -= 3
+        if bearish_engulfing:
             reasoning.append("✓ Bearish Engulfing Pattern")
-            
-        # Hammer / Pinbar (Bullish)
-        body = abs(close[-1] - open_p[-1])
-        wick_lower = min(close[-1], open_p[-1]) - low[-1]
-        wick_upper = high[-1] - max(close[-1], open_p[-1])
-        if wick_lower > 2 * body and wick_upper < body:
-            pattern_score += 1
+        if hammer:
             reasoning.append("✓ Bullish Pinbar/Hammer")
-            
-        # Shooting Star (Bearish)
-        if wick_upper > 2 * body and wick_lower < body:
-            pattern_score -= 1
+        if shooting_star:
             reasoning.append("✓ Bearish Shooting Star")
         
         # 6. ATR for Stop Loss Calculation
-        atr = self.calculate_atr(high, low, close, 14)
-        atr_current = atr[-1]
+        atr_current = b.atr[-1]
         
         # ========== ENSEMBLE SCORING ==========
         total_score = trend_score + rsi_score + macd_score + bb_score + volume_score + pattern_score
@@ -394,7 +662,8 @@ class QuantEngine:
             take_profit_3=tp3,
             risk_reward=risk_reward,
             strategy=primary_strategy,
-            reasoning=reasoning
+            reasoning=reasoning,
+            regime=regime.value
         )
 
 # Singleton
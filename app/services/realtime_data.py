@@ -10,16 +10,19 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from threading import Thread, Event, Lock
+from concurrent.futures import ThreadPoolExecutor
 import time
 import json
 import logging
 from typing import Dict, List, Callable, Optional
-from dataclasses import dataclass, asdict
-from app.services.mt5_bridge_client import mt5_bridge, BridgeTick, BridgeCandle
+from dataclasses import dataclass
+from app.services.mt5_bridge_client import mt5_bridge
+from app.services.bar_ring import BarRing
+from app.services.symbol_meta import price_decimals
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Tick:
     symbol: str
     bid: float
@@ -28,7 +31,7 @@ class Tick:
     volume: int
     time: int
 
-@dataclass 
+@dataclass(slots=True, frozen=True)
 class OHLC:
     time: int
     open: float
@@ -37,6 +40,53 @@ class OHLC:
     close: float
     volume: int
 
+TF_MAP = {
+    'M1': mt5.TIMEFRAME_M1, 'M5': mt5.TIMEFRAME_M5, 'M15': mt5.TIMEFRAME_M15,
+    'M30': mt5.TIMEFRAME_M30, 'H1': mt5.TIMEFRAME_H1, 'H4': mt5.TIMEFRAME_H4,
+    'D1': mt5.TIMEFRAME_D1
+}
+
+def _to_tick(symbol: str, src) -> Tick:
+    """Tick from any quote object with bid/ask/last/volume/time (MT5 tick or symbol info, bridge tick)"""
+    return Tick(symbol=symbol, bid=src.bid, ask=src.ask, last=src.last, volume=src.volume, time=src.time)
+
+def candles_to_arrays(candles) -> Dict[str, np.ndarray]:
+    """Convert a sequence of OHLC candles to column arrays"""
+    n = len(candles)
+    return {
+        'time': np.fromiter((c.time for c in candles), dtype=np.int64, count=n),
+        'open': np.fromiter((c.open for c in candles), dtype=np.float64, count=n),
+        'high': np.fromiter((c.high for c in candles), dtype=np.float64, count=n),
+        'low': np.fromiter((c.low for c in candles), dtype=np.float64, count=n),
+        'close': np.fromiter((c.close for c in candles), dtype=np.float64, count=n),
+        'volume': np.fromiter((c.volume for c in candles), dtype=np.float64, count=n),
+    }
+
+def rates_to_arrays(rates: np.ndarray) -> Dict[str, np.ndarray]:
+    """Split an MT5 rates structured array into contiguous column arrays"""
+    return {
+        'time': np.ascontiguousarray(rates['time'], dtype=np.int64),
+        'open': np.ascontiguousarray(rates['open'], dtype=np.float64),
+        'high': np.ascontiguousarray(rates['high'], dtype=np.float64),
+        'low': np.ascontiguousarray(rates['low'], dtype=np.float64),
+        'close': np.ascontiguousarray(rates['close'], dtype=np.float64),
+        'volume': np.ascontiguousarray(rates['tick_volume'], dtype=np.float64),
+    }
+
+def arrays_to_candles(bars: Dict[str, np.ndarray]) -> List[OHLC]:
+    """Build OHLC objects from column arrays"""
+    return [
+        OHLC(time=t, open=o, high=h, low=l, close=c, volume=int(v))
+        for t, o, h, l, c, v in zip(
+            bars['time'].tolist(), bars['open'].tolist(), bars['high'].tolist(),
+            bars['low'].tolist(), bars['close'].tolist(), bars['volume'].tolist()
+        )
+    ]
+
+# Live candle cache: bars kept per (symbol, timeframe), refreshed by tail fetches
+BAR_CACHE_CAPACITY = 2000
+BAR_TAIL_FETCH = 3
+
 class RealTimeDataService:
     """
     Manages real-time market data streaming.
@@ -67,6 +117,15 @@ class RealTimeDataService:
         self.pattern_overrides: Dict[str, str] = {}
         self.demo_mode = False # Explicit demo mode flag
         
+        # Cached live bars per (symbol, timeframe)
+        self._bars: Dict[tuple, BarRing] = {}
+        self._bars_lock = Lock()
+        # Called with (symbol, timeframe, candle) when a cached series gains a bar
+        self._candle_listeners: List[Callable] = []
+        
+        # Overlaps per-symbol Bridge HTTP round-trips in the batch getters
+        self._io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='rt-io')
+        
         # Initialize data sources
         self._init_data_sources()
         
@@ -91,8 +150,8 @@ class RealTimeDataService:
                 self.mt5_connected = False
             
             # Fallback to Bridge
-            mt5_bridge._check_connection()  # Re-check bridge
-            if mt5_bridge.connected:
+            mt5_bridge._check_connection()  # Re-check bridge (TCP only)
+            if mt5_bridge.is_live():  # Confirm /status answers before going live
                 self.bridge_connected = True
                 self.data_mode = "LIVE_BRIDGE"
                 self.symbols = self.default_symbols
@@ -166,14 +225,7 @@ class RealTimeDataService:
             try:
                 tick = mt5.symbol_info_tick(symbol)
                 if tick:
-                    return Tick(
-                        symbol=symbol,
-                        bid=tick.bid,
-                        ask=tick.ask,
-                        last=tick.last,
-                        volume=tick.volume,
-                        time=tick.time
-                    )
+                    return _to_tick(symbol, tick)
             except Exception as e:
                 logger.error(f"MT5 tick error: {e}")
         
@@ -181,14 +233,7 @@ class RealTimeDataService:
         if self.data_mode == "LIVE_BRIDGE" or (self.data_mode == "LIVE_MT5" and self.bridge_connected):
             bridge_tick = mt5_bridge.get_tick(symbol)
             if bridge_tick:
-                return Tick(
-                    symbol=symbol,
-                    bid=bridge_tick.bid,
-                    ask=bridge_tick.ask,
-                    last=bridge_tick.last,
-                    volume=bridge_tick.volume,
-                    time=bridge_tick.time
-                )
+                return _to_tick(symbol, bridge_tick)
         
         # No simulated fallback unless in demo_mode
         if self.demo_mode:
@@ -196,6 +241,40 @@ class RealTimeDataService:
             
         return None
     
+    def _batch(self, func, symbols: List[str], *args) -> list:
+        """Run a per-symbol getter for many symbols, concurrently when it goes over HTTP"""
+        if self.data_mode == "LIVE_MT5" or len(symbols) < 2:
+            return [func(s, *args) for s in symbols]
+        return list(self._io_pool.map(lambda s: func(s, *args), symbols))
+    
+    def get_live_prices(self, symbols: List[str]) -> Dict[str, Tick]:
+        """Current ticks for several symbols in one call; symbols without a price are omitted"""
+        if self.data_mode == "LIVE_MT5" and len(symbols) > 1:
+            ticks = self._mt5_ticks(symbols)
+        elif self.data_mode == "LIVE_BRIDGE":
+            ticks = {s: _to_tick(s, t) for s, t in mt5_bridge.get_ticks(symbols).items()}
+        else:
+            ticks = {}
+        missing = [s for s in symbols if s not in ticks]
+        for s, t in zip(missing, self._batch(self.get_live_price, missing)):
+            if t:
+                ticks[s] = t
+        return ticks
+    
+    def _mt5_ticks(self, symbols: List[str]) -> Dict[str, Tick]:
+        """Last quotes for many symbols from one symbols_get call instead of a tick request each"""
+        try:
+            infos = mt5.symbols_get(group=",".join(symbols))
+        except Exception as e:
+            logger.error(f"MT5 symbols_get error: {e}")
+            return {}
+        wanted = set(symbols)
+        return {
+            info.name: _to_tick(info.name, info)
+            for info in infos or ()
+            if info.name in wanted and info.bid > 0  # Unpriced (not in Market Watch) falls back per symbol
+        }
+    
     def _simulate_tick(self, symbol: str) -> Tick:
         """Generate simulated tick for demo mode"""
         base_prices = {
@@ -212,62 +291,40 @@ class RealTimeDataService:
         
         spread = new_price * 0.00005  # 0.5 pip spread
         
+        # Quote at broker precision once here, so consumers never re-round
+        decimals = price_decimals(symbol)
         return Tick(
             symbol=symbol,
-            bid=new_price - spread/2,
-            ask=new_price + spread/2,
+            bid=round(new_price - spread/2, decimals),
+            ask=round(new_price + spread/2, decimals),
             last=new_price,
             volume=int(np.random.exponential(1000)),
             time=int(datetime.now().timestamp())
         )
     
+    def _fetch_mt5_rates(self, symbol: str, timeframe: str, count: int) -> Optional[np.ndarray]:
+        """Raw MT5 rates (structured array) or None on failure"""
+        try:
+            tf = TF_MAP.get(timeframe, mt5.TIMEFRAME_M5)
+            rates = mt5.copy_rates_from_pos(symbol, tf, 0, count)
+            if rates is not None and len(rates) > 0:
+                return rates
+        except Exception as e:
+            logger.error(f"MT5 candle error: {e}")
+        return None
+
     def get_historical_candles(self, symbol: str, timeframe: str, count: int = 500) -> List[OHLC]:
         """Get historical OHLC data - Priority: MT5 Direct > Bridge > Simulated"""
-        tf_map = {
-            'M1': mt5.TIMEFRAME_M1, 'M5': mt5.TIMEFRAME_M5, 'M15': mt5.TIMEFRAME_M15,
-            'M30': mt5.TIMEFRAME_M30, 'H1': mt5.TIMEFRAME_H1, 'H4': mt5.TIMEFRAME_H4,
-            'D1': mt5.TIMEFRAME_D1
-        }
-        
         # Check for Pattern Overrides (for testing)
         if symbol in self.pattern_overrides:
             pattern = self.pattern_overrides.pop(symbol)
             logger.info(f"Injecting simulated pattern: {pattern} for {symbol}")
             return self._generate_pattern_candles(symbol, timeframe, count, pattern)
 
-        # Try direct MT5
-        if self.data_mode == "LIVE_MT5":
-            try:
-                tf = tf_map.get(timeframe, mt5.TIMEFRAME_M5)
-                rates = mt5.copy_rates_from_pos(symbol, tf, 0, count)
-                if rates is not None and len(rates) > 0:
-                    return [
-                        OHLC(
-                            time=int(r['time']),
-                            open=float(r['open']),
-                            high=float(r['high']),
-                            low=float(r['low']),
-                            close=float(r['close']),
-                            volume=int(r['tick_volume'])
-                        ) for r in rates
-                    ]
-            except Exception as e:
-                logger.error(f"MT5 candle error: {e}")
-        
-        # Try Bridge
-        if self.data_mode == "LIVE_BRIDGE" or self.bridge_connected:
-            bridge_candles = mt5_bridge.get_candles(symbol, timeframe, count)
-            if bridge_candles:
-                return [
-                    OHLC(
-                        time=c.time,
-                        open=c.open,
-                        high=c.high,
-                        low=c.low,
-                        close=c.close,
-                        volume=c.volume
-                    ) for c in bridge_candles
-                ]
+        # Live MT5 / Bridge (cached)
+        bars = self._live_arrays(symbol, timeframe, count)
+        if bars is not None:
+            return arrays_to_candles(bars)
         
         # Simulated fallback (only if demo_mode or pattern injected)
         if self.demo_mode:
@@ -275,6 +332,99 @@ class RealTimeDataService:
             
         return []
     
+    def get_historical_candles_batch(self, symbols: List[str], timeframe: str, count: int = 500) -> Dict[str, List[OHLC]]:
+        """get_historical_candles for several symbols in one call"""
+        results = self._batch(self.get_historical_candles, symbols, timeframe, count)
+        return dict(zip(symbols, results))
+    
+    def get_historical_arrays(self, symbol: str, timeframe: str, count: int = 500) -> Dict[str, np.ndarray]:
+        """
+        Get historical OHLC data as contiguous column arrays
+        (time, open, high, low, close, volume). Same source priority
+        as get_historical_candles. Live data is served from the bar
+        cache as read-only views.
+        """
+        if symbol in self.pattern_overrides:
+            return candles_to_arrays(self.get_historical_candles(symbol, timeframe, count))
+
+        bars = self._live_arrays(symbol, timeframe, count)
+        if bars is not None:
+            return bars
+
+        if self.demo_mode:
+            return candles_to_arrays(self._simulate_candles(symbol, timeframe, count))
+
+        return candles_to_arrays([])
+    
+    def _fetch_live_arrays(self, symbol: str, timeframe: str, count: int) -> Optional[Dict[str, np.ndarray]]:
+        """Fetch bars from MT5 direct, falling back to the Bridge"""
+        if self.data_mode == "LIVE_MT5":
+            rates = self._fetch_mt5_rates(symbol, timeframe, count)
+            if rates is not None:
+                return rates_to_arrays(rates)
+        
+        if self.data_mode == "LIVE_BRIDGE" or self.bridge_connected:
+            bars = mt5_bridge.get_candles(symbol, timeframe, count)
+            if bars is not None:
+                return bars
+        
+        return None
+    
+    def _live_arrays(self, symbol: str, timeframe: str, count: int) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Live bars through the per-(symbol, timeframe) cache. A warm cache only
+        pulls the last few bars from the source and merges them in; a cold or
+        gapped one reloads the full window.
+        """
+        if self.data_mode == "DISCONNECTED" and not self.bridge_connected:
+            return None
+        if count > BAR_CACHE_CAPACITY:
+            return self._fetch_live_arrays(symbol, timeframe, count)
+        
+        key = (symbol, timeframe)
+        with self._bars_lock:
+            ring = self._bars.get(key)
+            warm = ring is not None and (len(ring) >= count or ring.exhausted)
+            prev_time = ring.last_time() if ring is not None else -1
+        
+        out = None
+        if warm:
+            tail = self._fetch_live_arrays(symbol, timeframe, BAR_TAIL_FETCH)
+            if tail is None:
+                return None
+            with self._bars_lock:
+                if ring.merge(tail):
+                    out = ring.tail(count)
+        
+        if out is None:
+            bars = self._fetch_live_arrays(symbol, timeframe, BAR_CACHE_CAPACITY)
+            if bars is None:
+                return None
+            with self._bars_lock:
+                ring = self._bars.get(key)
+                if ring is None:
+                    ring = self._bars[key] = BarRing(BAR_CACHE_CAPACITY)
+                ring.load(bars, BAR_CACHE_CAPACITY)
+                out = ring.tail(count)
+        
+        if len(out['time']) and out['time'][-1] > prev_time:
+            self._notify_new_candle(symbol, timeframe, out)
+        return out
+    
+    def on_new_candle(self, callback: Callable):
+        """Register callback(symbol, timeframe, candle) for bars newly seen by the cache"""
+        self._candle_listeners.append(callback)
+    
+    def _notify_new_candle(self, symbol: str, timeframe: str, bars: Dict[str, np.ndarray]):
+        if not self._candle_listeners:
+            return
+        candle = arrays_to_candles({f: v[-1:] for f, v in bars.items()})[0]
+        for callback in self._candle_listeners:
+            try:
+                callback(symbol, timeframe, candle)
+            except Exception as e:
+                logger.error(f"Candle listener error: {e}")
+    
     def _generate_pattern_candles(self, symbol: str, timeframe: str, count: int, pattern: str) -> List[OHLC]:
         """Generate a series of candles that match a specific technical pattern"""
         now = int(datetime.now().timestamp())
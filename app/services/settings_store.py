@@ -1,4 +1,6 @@
 import logging
+import math
+from collections import deque
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -12,25 +14,90 @@ _settings = {
     "risk_reward_min": 1.5,
     "target_risk_reward": 1.5,
     "news_buffer": 30,
+    "scan_interval": 10,
     "paper_mode": False,
     "telegram_enabled": True,
     "telegram_bot_token": "",
     "telegram_chat_id": ""
 }
 
-# Log buffer for terminal view
-_log_buffer = []
+_TRUE_STRINGS = frozenset(('1', 'true', 'yes', 'on'))
+_FALSE_STRINGS = frozenset(('0', 'false', 'no', 'off'))
+
+def _to_bool(value):
+    """Only bools, 0/1 and the explicit on/off strings; anything else is an error"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE_STRINGS:
+            return True
+        if text in _FALSE_STRINGS:
+            return False
+    elif isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    raise ValueError(value)
+
+def _scalar(value):
+    """Only strings and plain numbers are accepted for non-bool settings"""
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise TypeError(type(value).__name__)
+    return value
+
+def _to_float(value):
+    number = float(_scalar(value))
+    if not math.isfinite(number):
+        raise ValueError(value)
+    return number
+
+def _to_int(value):
+    value = _scalar(value)
+    if isinstance(value, int):
+        return value
+    number = _to_float(value)
+    if not number.is_integer():  # 2.9 is an error, not 2
+        raise ValueError(value)
+    return int(number)
+
+def _to_str(value):
+    return str(_scalar(value))
+
+# Coercion per setting, derived once from the defaults above
+_COERCE_BY_TYPE = {bool: _to_bool, int: _to_int, float: _to_float, str: _to_str}
+_SETTING_COERCE = {
+    key: _COERCE_BY_TYPE[type(default)]
+    for key, default in _settings.items()
+}
+_SETTING_KEYS = frozenset(_SETTING_COERCE)
+
+def coerce_settings(data: dict):
+    """
+    Filter a client payload down to known settings with their proper types.
+    Returns (accepted, rejected_keys); unknown keys are dropped silently.
+    """
+    accepted, rejected = {}, []
+    for key, value in data.items():
+        if key not in _SETTING_KEYS:
+            continue
+        try:
+            if value is None:
+                raise ValueError(key)
+            accepted[key] = _SETTING_COERCE[key](value)
+        except (TypeError, ValueError):
+            rejected.append(key)
+    return accepted, rejected
+
+# Log buffer for terminal view (newest first, oldest dropped past maxlen)
+_log_buffer = deque(maxlen=100)
 
 def add_log(source: str, message: str, level: str = "info"):
     """Add log to buffer for API exposure"""
-    _log_buffer.insert(0, {
+    _log_buffer.appendleft({
         "time": datetime.now().isoformat(),
         "source": source,
         "message": message,
         "level": level
     })
-    if len(_log_buffer) > 100:
-        _log_buffer.pop()
 
 def get_settings():
     return _settings
@@ -10,6 +10,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import logging
+from app.services.quant_engine import true_range
+from app.services._indicators_njit import last_ema
 
 logger = logging.getLogger(__name__)
 
@@ -62,18 +64,16 @@ class SmartBrain:
         low = df['low'].values
         
         # EMA for Trend Direction
-        ema_20 = pd.Series(close).ewm(span=20).mean().iloc[-1]
-        ema_50 = pd.Series(close).ewm(span=50).mean().iloc[-1]
+        ema_20 = last_ema(close, 20, True)
+        ema_50 = last_ema(close, 50, True)
         
         # ATR for Volatility
-        tr = np.maximum(high[1:] - low[1:], 
-                        np.maximum(np.abs(high[1:] - close[:-1]), 
-                                   np.abs(low[1:] - close[:-1])))
+        tr = true_range(high, low, close)
         atr_14 = np.mean(tr[-14:])
         atr_50 = np.mean(tr[-50:])
         
         # ADX Proxy (Simplified: EMA slope)
-        ema_slope = (ema_20 - pd.Series(close).ewm(span=20).mean().iloc[-10]) / 10
+        ema_slope = (ema_20 - last_ema(close[:-9], 20, True)) / 10
         
         # Classification
         if atr_14 > atr_50 * 1.5:
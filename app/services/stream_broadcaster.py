@@ -0,0 +1,169 @@
+"""
+SSE BROADCASTER
+- One producer thread polls ticks and encodes each SSE frame once
+- New M1 candles are pushed by realtime_service; the producer only fetches
+  a candle when a tick has moved into a minute it has not seen yet
+- Every /stream client gets the same pre-encoded bytes via its own queue
+- Producer starts with the first subscriber and exits after the last leaves
+"""
+import logging
+import queue
+import time
+from threading import Thread, Lock
+from typing import Dict, Optional, Set
+
+import orjson
+
+from app.services.realtime_data import realtime_service, OHLC
+from app.services.symbol_meta import pip_scale
+
+logger = logging.getLogger(__name__)
+
+STREAM_SYMBOLS = ('EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD', 'BTCUSD')
+HEARTBEAT_FRAME = b'data: {"type":"heartbeat"}\n\n'
+HEARTBEAT_INTERVAL = 10.0  # Seconds between keep-alive frames
+SUBSCRIBER_QUEUE_SIZE = 64  # Frames buffered for a slow client before dropping
+CANDLE_RETRY_SECONDS = 5.0  # Minimum gap between candle fetches for a symbol still waiting on its new bar
+
+
+def sse_frame(packet: dict) -> bytes:
+    return b"data: " + orjson.dumps(packet, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n\n"
+
+
+class StreamBroadcaster:
+    """
+    Fan-out of live market frames to SSE subscribers.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._subscribers: Set[queue.Queue] = set()
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+        # Latest candle frame per symbol, replayed to new subscribers
+        self._last_candle_frames: Dict[str, bytes] = {}
+        self._last_candle_times: Dict[str, int] = {}
+        self._retry_after: Dict[str, float] = {}  # Monotonic time before which a symbol is not refetched
+        realtime_service.on_new_candle(self._on_candle)
+
+    def subscribe(self) -> queue.Queue:
+        """Register a client; starts the producer if it is not running"""
+        q = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            for frame in self._last_candle_frames.values():
+                q.put_nowait(frame)
+            self._subscribers.add(q)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._produce, daemon=True)
+                self._thread.start()
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def _publish(self, frame: bytes):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(frame)
+            except queue.Full:
+                pass  # Client is not draining, drop rather than block everyone
+
+    def _produce(self):
+        """Build and publish frames until nobody is subscribed"""
+        # Monotonic deadlines: each cadence fires exactly once per period
+        next_tick = next_heartbeat = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            now = time.monotonic()
+            try:
+                ticks = realtime_service.get_live_prices(STREAM_SYMBOLS)
+                if ticks:  # Nothing priced this cycle, save the bandwidth
+                    self._publish(sse_frame(self._tick_packet(ticks)))
+                self._fetch_rolled_candles(ticks)
+
+                if now >= next_heartbeat:
+                    next_heartbeat = now + HEARTBEAT_INTERVAL
+                    self._publish(HEARTBEAT_FRAME)
+            except Exception as e:
+                logger.error(f"SSE producer error: {e}")
+
+            # Sleep to the next slot rather than a fixed interval, so fetch time doesn't drift the cadence
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()  # Overran, resync instead of bursting
+
+    def _tick_packet(self, ticks: Dict) -> dict:
+        data_packet = {
+            'type': 'tick_update',
+            'ticks': {}
+        }
+        # Prices go out as quoted; the dashboard formats them with toFixed(decimals)
+        for symbol, tick in ticks.items():
+            pips = pip_scale(symbol)
+            data_packet['ticks'][symbol] = {
+                'bid': tick.bid,
+                'ask': tick.ask,
+                'spread': int((tick.ask - tick.bid) * pips * 10 + 0.5) / 10,
+                'time': tick.time
+            }
+        return data_packet
+
+    def _fetch_rolled_candles(self, ticks: Dict):
+        """
+        Fetch the M1 candle for symbols whose latest tick lands in a minute
+        no candle has been seen for (candle times floored to the minute). A
+        symbol stays due until _on_candle records a bar for that minute, but
+        is fetched at most every CANDLE_RETRY_SECONDS, so an empty or stale
+        reply is retried without polling on every cycle.
+        """
+        due = []
+        now = time.monotonic()
+        with self._lock:
+            for symbol, tick in ticks.items():
+                minute = tick.time - tick.time % 60
+                last = self._last_candle_times.get(symbol, -1)
+                if minute > last - last % 60 and now >= self._retry_after.get(symbol, 0.0):
+                    self._retry_after[symbol] = now + CANDLE_RETRY_SECONDS
+                    due.append(symbol)
+        if not due:
+            return
+        # Live fetches also reach _on_candle through the realtime_service hook
+        batch = realtime_service.get_historical_candles_batch(due, 'M1', 1)
+        for symbol, candles in batch.items():
+            if candles:
+                self._on_candle(symbol, 'M1', candles[-1])
+
+    def _on_candle(self, symbol: str, timeframe: str, candle: OHLC):
+        """Publish a candle_update when an M1 bar newer than the last one appears"""
+        if timeframe != 'M1' or symbol not in STREAM_SYMBOLS:
+            return
+        with self._lock:
+            if candle.time <= self._last_candle_times.get(symbol, -1):
+                return
+            self._last_candle_times[symbol] = candle.time
+            frame = sse_frame({
+                'type': 'candle_update',
+                'symbol': symbol,
+                'candle': {
+                    'time': candle.time,
+                    'open': candle.open,
+                    'high': candle.high,
+                    'low': candle.low,
+                    'close': candle.close
+                }
+            })
+            self._last_candle_frames[symbol] = frame
+        self._publish(frame)
+
+
+# Singleton
+stream_broadcaster = StreamBroadcaster()
@@ -0,0 +1,55 @@
+"""
+SYMBOL METADATA
+- Per-symbol price precision, pip scale and contract size as a lookup table
+- Unknown (dynamically loaded) symbols are classified once, then cached
+"""
+from collections import namedtuple
+from typing import Dict
+
+# decimals: display precision, pip_scale: price delta -> pips, contract_size: units per lot
+SymbolMeta = namedtuple('SymbolMeta', 'decimals pip_scale contract_size')
+
+_FX = SymbolMeta(5, 1e4, 100_000)
+_JPY = SymbolMeta(3, 1e2, 100_000)
+_METAL = SymbolMeta(2, 1e1, 100)
+_CRYPTO = SymbolMeta(2, 1e0, 1)
+
+_MAX_SYMBOLS = 1024  # Symbols come from URLs too, keep the table bounded
+
+_META: Dict[str, SymbolMeta] = {
+    'EURUSD': _FX, 'GBPUSD': _FX, 'USDCHF': _FX, 'AUDUSD': _FX, 'NZDUSD': _FX, 'USDCAD': _FX,
+    'USDJPY': _JPY, 'EURJPY': _JPY, 'GBPJPY': _JPY,
+    'XAUUSD': _METAL,
+    'BTCUSD': _CRYPTO, 'ETHUSD': _CRYPTO,
+}
+
+
+def _classify(symbol: str) -> SymbolMeta:
+    upper = symbol.upper()
+    if 'JPY' in upper:
+        return _JPY
+    if 'XAU' in upper:
+        return _METAL
+    if 'BTC' in upper or 'ETH' in upper:
+        return _CRYPTO
+    return _FX
+
+
+def symbol_meta(symbol: str) -> SymbolMeta:
+    """(decimals, pip_scale, contract_size) for a symbol"""
+    meta = _META.get(symbol)
+    if meta is None:
+        meta = _classify(symbol)
+        if len(_META) < _MAX_SYMBOLS:
+            _META[symbol] = meta
+    return meta
+
+
+def price_decimals(symbol: str) -> int:
+    """Display precision for a symbol's prices"""
+    return symbol_meta(symbol).decimals
+
+
+def pip_scale(symbol: str) -> float:
+    """Multiplier turning a price difference into pips"""
+    return symbol_meta(symbol).pip_scale
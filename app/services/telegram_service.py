@@ -1,14 +1,26 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import os
 from threading import Thread
 
 logger = logging.getLogger(__name__)
 
+SEND_MESSAGE_URL = "https://api.telegram.org/bot{token}/sendMessage"
+
+# Shared keep-alive session: one TCP/TLS connection reused across alerts.
+# Retry only covers connection failures (POST is not retried on read errors).
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+
 class TelegramService:
     def __init__(self, bot_token=None):
         self.bot_token = bot_token or "8395921588:AAFuvDgx7bsI6jltukIkSO3N8XO4Y8S-vNQ"
-        self.api_url = f"https://api.telegram.org/bot{self.bot_token}"
+        self.send_url = SEND_MESSAGE_URL.format(token=self.bot_token)
         
     def send_message(self, chat_id, text, parse_mode="Markdown"):
         """Send message via a background thread to not block the main loop"""
@@ -18,14 +30,13 @@ class TelegramService:
             
         def _send():
             try:
-                url = f"{self.api_url}/sendMessage"
                 payload = {
                     "chat_id": chat_id,
                     "text": text,
                     "parse_mode": parse_mode,
                     "disable_web_page_preview": True
                 }
-                res = requests.post(url, json=payload, timeout=10)
+                res = session.post(self.send_url, json=payload, timeout=10)
                 if res.status_code == 200:
                     logger.info(f"Telegram message sent to {chat_id}")
                 else:
@@ -98,6 +98,28 @@ class TradingLoop:
             
             time.sleep(interval_seconds)
     
+    def run_until_stopped(self, stop_event, interval_seconds=300):
+        """
+        Run the trading loop until `stop_event` is set.
+        Waiting on the event means a stop request ends the loop immediately
+        instead of after the current sleep.
+        """
+        self.running = True
+        logger.info(f"[Loop] Starting trading loop with {interval_seconds}s interval")
+        
+        while True:
+            try:
+                result = self.run_cycle()
+                logger.info(f"[Loop] Cycle Result: {result}")
+            except Exception as e:
+                logger.error(f"[Loop] Error: {e}")
+            
+            if stop_event.wait(interval_seconds):
+                break
+        
+        self.running = False
+        logger.info("[Loop] Trading loop stopped.")
+    
     def stop(self):
         self.running = False
         logger.info("[Loop] Trading loop stopped.")
@@ -9,7 +9,7 @@ from flask_socketio import SocketIO, emit
 from threading import Thread, Event
 import time
 import logging
-from dataclasses import asdict
+from app.services.symbol_meta import price_decimals, symbol_meta
 
 logger = logging.getLogger(__name__)
 
@@ -57,14 +57,14 @@ class RealtimeStreamer:
                 for symbol in self.symbols:
                     tick = realtime_service.get_live_price(symbol)
                     if tick and socketio:
-                        decimals = 2 if symbol in ['XAUUSD', 'BTCUSD'] else 5
+                        decimals, pips, _ = symbol_meta(symbol)
                         
                         # Emit tick update
                         socketio.emit('tick', {
                             'symbol': tick.symbol,
                             'bid': round(tick.bid, decimals),
                             'ask': round(tick.ask, decimals),
-                            'spread': round((tick.ask - tick.bid) * (100 if symbol in ['XAUUSD', 'BTCUSD'] else 10000), 1),
+                            'spread': round((tick.ask - tick.bid) * pips, 1),
                             'time': tick.time
                         })
                 
@@ -89,7 +89,7 @@ class RealtimeStreamer:
                     last_time = self.last_candle_time.get(symbol, 0)
                     
                     if latest.time > last_time and socketio:
-                        decimals = 2 if symbol in ['XAUUSD', 'BTCUSD'] else 5
+                        decimals = price_decimals(symbol)
                         socketio.emit('candle', {
                             'symbol': symbol,
                             'time': latest.time,
@@ -67,6 +67,16 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }).observe(chartContainer);
 
+    // /api/history sends columns {t, o, h, l, c}; zip them into candle objects
+    function candlesFromColumns(cols) {
+        const n = cols.t ? cols.t.length : 0;
+        const candles = new Array(n);
+        for (let i = 0; i < n; i++) {
+            candles[i] = { time: cols.t[i], open: cols.o[i], high: cols.h[i], low: cols.l[i], close: cols.c[i] };
+        }
+        return candles;
+    }
+
     // Fetch and Display Data
     function loadChartData(symbol, timeframe) {
         console.log('Loading chart data for', symbol, timeframe);
@@ -75,13 +85,14 @@ document.addEventListener('DOMContentLoaded', () => {
                 if (!response.ok) throw new Error('Network response was not ok');
                 return response.json();
             })
-            .then(data => {
-                console.log('Received data:', data.length, 'candles');
-                if (data.error) {
-                    console.error('API Error:', data.error);
+            .then(payload => {
+                if (payload.error) {
+                    console.error('API Error:', payload.error);
                     return;
                 }
-                if (Array.isArray(data) && data.length > 0) {
+                const data = candlesFromColumns(payload);
+                console.log('Received data:', data.length, 'candles');
+                if (data.length > 0) {
                     candleSeries.setData(data);
                     chart.timeScale().fitContent();
                     console.log('Chart data set successfully');
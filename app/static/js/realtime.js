@@ -80,11 +80,22 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     };
     
+    // /api/history sends columns {t, o, h, l, c}; zip them into candle objects
+    const candlesFromColumns = (cols) => {
+        const n = cols.t.length;
+        const candles = new Array(n);
+        for (let i = 0; i < n; i++) {
+            candles[i] = { time: cols.t[i], open: cols.o[i], high: cols.h[i], low: cols.l[i], close: cols.c[i] };
+        }
+        return candles;
+    };
+    
     const loadChartData = async () => {
         try {
             const res = await fetch(`/api/history/${currentSymbol}/${currentTimeframe}`);
-            const data = await res.json();
-            if (Array.isArray(data) && candleSeries) {
+            const payload = await res.json();
+            if (payload.t && candleSeries) {
+                const data = candlesFromColumns(payload);
                 // Ensure data is sorted by time
                 data.sort((a, b) => a.time - b.time);
                 candleSeries.setData(data);
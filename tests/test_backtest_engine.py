@@ -0,0 +1,132 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+import numpy.testing as npt
+import pandas as pd
+import pytest
+
+from app.services.backtest_engine import (
+	BacktestEngine, TradeDirection, WARMUP_BARS,
+	_max_dd, _max_dd_numpy, _return_stats, _return_stats_numpy,
+)
+
+
+def make_df(n=600):
+	rng = np.random.default_rng(1)
+	close = 1.1 + np.cumsum(rng.normal(0, 0.0005, n))
+	return pd.DataFrame({
+		'time': np.arange(n) * 60 + 1_700_000_000,
+		'open': close,
+		'high': close + np.abs(rng.normal(0, 0.0004, n)),
+		'low': close - np.abs(rng.normal(0, 0.0004, n)),
+		'close': close,
+	})
+
+
+def make_signals(n=600):
+	idx = np.arange(n)
+	buys = idx % 7 == 0
+	sells = (idx % 11 == 0) & ~buys
+	return buys, sells
+
+
+def make_strategy(buys, sells):
+	def strategy(historical_df):
+		i = len(historical_df) - 1
+		price = historical_df['close'].iloc[-1]
+		if buys[i]:
+			return ('BUY', price, price - 0.002, price + 0.003)
+		if sells[i]:
+			return ('SELL', price, price + 0.002, price - 0.003)
+		return None
+	return strategy
+
+
+def test_exits_at_stop_or_target():
+	df = make_df()
+	result = BacktestEngine().run_backtest(df, make_strategy(*make_signals()))
+
+	assert result.total_trades > 0
+	assert len(result.equity_curve) == len(df) - WARMUP_BARS + 1
+	for trade in result.trades[:-1]:
+		assert trade.exit_price in (trade.stop_loss, trade.take_profit)
+		sign = 1 if trade.direction == TradeDirection.LONG else -1
+		assert trade.pnl == pytest.approx(sign * (trade.exit_price - trade.entry_price) * trade.size)
+	assert result.total_pnl == pytest.approx(sum(t.pnl for t in result.trades))
+
+
+def test_signal_arrays_match_strategy_callback():
+	df = make_df()
+	buys, sells = make_signals()
+	close = df['close'].to_numpy()
+	dirs = np.where(buys, 1, np.where(sells, -1, 0))
+	sl = np.where(buys, close - 0.002, close + 0.002)
+	tp = np.where(buys, close + 0.003, close - 0.003)
+
+	expected = BacktestEngine().run_backtest(df, make_strategy(buys, sells))
+	result = BacktestEngine().run_signals(df, dirs, close, sl, tp)
+
+	assert result.total_trades == expected.total_trades
+	assert result.total_pnl == pytest.approx(expected.total_pnl)
+	npt.assert_allclose(result.equity_curve, expected.equity_curve)
+
+
+def test_batch_columns_match_single_runs():
+	df = make_df()
+	buys, sells = make_signals()
+	close = df['close'].to_numpy()
+	dirs = np.stack([np.where(buys, 1, 0), np.where(sells, -1, 0)], axis=1)
+	width = np.array([0.002, 0.004])
+	entries = np.repeat(close[:, None], 2, axis=1)
+	sl = entries - dirs * width
+	tp = entries + dirs * 1.5 * width
+
+	engine = BacktestEngine()
+	batch = engine.run_batch(df, dirs, entries, sl, tp)
+	for p in range(2):
+		result = engine.batch_result(df, batch, p)
+		expected = BacktestEngine().run_signals(df, dirs[:, p], entries[:, p], sl[:, p], tp[:, p])
+		assert result.total_trades == expected.total_trades
+		assert result.total_pnl == pytest.approx(expected.total_pnl)
+		npt.assert_allclose(result.equity_curve, expected.equity_curve)
+
+
+def test_fused_equity_stats_match_array_versions():
+	equity = BacktestEngine().run_backtest(make_df(), make_strategy(*make_signals())).equity_curve
+	npt.assert_allclose(_max_dd(equity), _max_dd_numpy(equity))
+	npt.assert_allclose(_return_stats(equity), _return_stats_numpy(equity))
+
+
+def test_stream_mode_matches_full_metrics():
+	df = make_df()
+	strategy = make_strategy(*make_signals())
+	with tempfile.TemporaryDirectory() as tmp:
+		engine = BacktestEngine(mode='stream', equity_mmap_path=os.path.join(tmp, 'equity.f4'),
+								trades_path=os.path.join(tmp, 'trades.npy'))
+		with patch('app.services.backtest_engine.TRADE_TAIL', 3):
+			result = engine.run_backtest(df, strategy)
+		expected = BacktestEngine().run_backtest(df, strategy)
+
+		assert result.total_trades == expected.total_trades
+		assert result.total_pnl == pytest.approx(expected.total_pnl)
+		assert result.max_drawdown_percent == pytest.approx(expected.max_drawdown_percent, abs=5e-4)
+		assert result.equity_curve.dtype == np.float32
+		npt.assert_array_equal(result.trade_records, expected.trade_records[-3:])
+		assert os.path.exists(os.path.join(tmp, 'trades.npy'))
+
+
+def test_monte_carlo_bands():
+	engine = BacktestEngine()
+	result = engine.run_backtest(make_df(), make_strategy(*make_signals()))
+	mc = engine.monte_carlo(n_sims=2000, backend='numpy', seed=7)
+
+	final = list(mc['final_equity'].values())
+	assert final == sorted(final)
+	assert mc['n_trades'] == result.total_trades
+	# Resampling keeps the expected P&L, so the median path lands near the realised one
+	expected = engine.initial_capital + result.total_pnl
+	tolerance = abs(result.total_pnl) + 0.05 * engine.initial_capital
+	assert mc['final_equity']['p50'] == pytest.approx(expected, abs=tolerance)
+	assert mc['max_drawdown_percent']['p5'] >= 0
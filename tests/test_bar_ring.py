@@ -0,0 +1,77 @@
+import numpy as np
+import numpy.testing as npt
+
+from app.services.bar_ring import BarRing, FIELDS
+
+
+def make_bars(start, n, price=1.0):
+	t = np.arange(start, start + n, dtype=np.int64) * 60
+	close = price + np.arange(n, dtype=np.float64)
+	return {f: (t if f == 'time' else close.copy()) for f in FIELDS}
+
+
+def test_tail_fetch_updates_forming_bar_and_appends():
+	ring = BarRing(10)
+	ring.load(make_bars(0, 10), 10)
+
+	# Last bar re-quoted, two new bars
+	tail = make_bars(9, 3, price=100.0)
+	assert ring.merge(tail)
+
+	out = ring.tail(10)
+	assert len(out['time']) == 10
+	assert out['time'][-1] == 11 * 60
+	npt.assert_array_equal(out['close'][-3:], [100.0, 101.0, 102.0])
+	assert not out['close'].flags.writeable
+
+
+def test_gap_requires_reload():
+	ring = BarRing(10)
+	ring.load(make_bars(0, 10), 10)
+	assert not ring.merge(make_bars(20, 3))
+
+
+def test_views_survive_compaction():
+	ring = BarRing(4)
+	ring.load(make_bars(0, 4), 4)
+	before = ring.tail(4)
+	snapshot = before['time'].copy()
+
+	for i in range(4, 12):
+		assert ring.merge(make_bars(i - 1, 2))
+
+	npt.assert_array_equal(before['time'], snapshot)
+	npt.assert_array_equal(ring.tail(4)['time'], np.arange(8, 12) * 60)
+
+
+def test_views_survive_overlapping_merge():
+	ring = BarRing(10)
+	ring.load(make_bars(0, 10), 10)
+	before = ring.tail(10)
+	snapshot = {f: before[f].copy() for f in FIELDS}
+
+	# Last two bars re-quoted plus a new one
+	assert ring.merge(make_bars(8, 3, price=500.0))
+
+	for f in FIELDS:
+		npt.assert_array_equal(before[f], snapshot[f])
+	npt.assert_array_equal(ring.tail(3)['close'], [500.0, 501.0, 502.0])
+	npt.assert_array_equal(ring.tail(10)['time'], np.arange(1, 11) * 60)
+
+
+def test_requoting_the_forming_bar_reuses_the_arrays():
+	ring = BarRing(10)
+	ring.load(make_bars(0, 10), 10)
+	first = ring.tail(10)
+
+	for i in range(10, 15):
+		# Re-quote the forming bar, then a new bar opens; the two bars before it come back unchanged
+		requote = make_bars(i - 3, 3, price=i - 2.0)
+		requote['close'][-1] += 0.5
+		assert ring.merge(requote)
+		assert ring.merge(make_bars(i - 2, 3, price=i - 1.0))
+		out = ring.tail(10)
+		assert np.shares_memory(out['close'], first['close'])
+		assert out['time'][-1] == i * 60
+
+	npt.assert_array_equal(first['close'][:-1], np.arange(1.0, 10.0))
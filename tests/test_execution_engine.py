@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+pytest.importorskip("MetaTrader5")  # Only ships for Windows
+
+from app.services.execution_engine import ExecutionEngine
+
+
+def make_engine():
+	"""Paper engine holding A/C long and B/D short, SL 0.1 against, TP 0.2 in favour"""
+	engine = ExecutionEngine(paper_trading=True)
+	for symbol, side, price in [('A', 'BUY', 1.0), ('B', 'SELL', 2.0), ('C', 'BUY', 3.0), ('D', 'SELL', 4.0)]:
+		sign = 1 if side == 'BUY' else -1
+		engine.place_order(symbol, side, 100, price, price - sign * 0.1, price + sign * 0.2)
+	return engine
+
+
+def test_mark_to_market_closes_sl_and_tp_hits():
+	engine = make_engine()
+	entries = {p['symbol']: p['entry_price'] for p in engine.get_open_positions()}
+	engine.update_positions({'A': 1.05, 'B': 2.25, 'C': 3.3, 'D': 3.95})
+
+	assert list(engine.positions) == ['A', 'D']
+	assert engine.paper_balance == pytest.approx(
+		10000 + (entries['B'] - 2.25) * 100 + (3.3 - entries['C']) * 100)
+	open_pnl = (1.05 - entries['A']) * 100 + (entries['D'] - 3.95) * 100
+	assert engine.paper_equity == pytest.approx(engine.paper_balance + open_pnl)
+	assert engine.positions['D'].unrealized_pnl == pytest.approx((entries['D'] - 3.95) * 100)
+
+
+def test_unpriced_positions_keep_last_price():
+	engine = make_engine()
+	engine.update_positions({'A': 1.05})
+	engine.update_positions({})
+	assert engine.positions['A'].current_price == 1.05
+	assert len(engine.positions) == 4
+
+
+def test_adding_to_a_position_weights_the_entry_by_quantity():
+	engine = make_engine()
+	held = engine.positions['A']
+	engine.positions.open('A', 'BUY', 300, 1.2, held.stop_loss, held.take_profit)
+
+	position = engine.positions['A']
+	assert position.quantity == 400
+	assert position.entry_price == pytest.approx((held.entry_price * 100 + 1.2 * 300) / 400)
+
+
+def test_snapshots_stay_consistent_under_concurrent_closes():
+	"""Every snapshot row must belong to its symbol while other threads open and close"""
+	engine = ExecutionEngine(paper_trading=True)
+	errors = []
+
+	def churn(offset):
+		try:
+			for _ in range(300):
+				for k in range(offset, offset + 8):
+					engine.positions.open(f'S{k}', 'BUY', k, float(k), 0.0, 1e9)
+				for k in range(offset, offset + 8):
+					engine.close_position(f'S{k}', float(k))
+					engine.close_position(f'S{k}', float(k))  # Second close is a no-op
+		except Exception as e:
+			errors.append(e)
+
+	def read():
+		try:
+			for _ in range(2000):
+				for pos in engine.positions.values():
+					k = int(pos.symbol[1:])
+					assert pos.quantity == k and pos.entry_price == k
+		except Exception as e:
+			errors.append(e)
+
+	threads = [threading.Thread(target=churn, args=(o,)) for o in (1, 9)] + [threading.Thread(target=read)]
+	for t in threads:
+		t.start()
+	for t in threads:
+		t.join()
+
+	assert errors == []
+	assert len(engine.positions) == 0
+	assert engine.paper_balance == pytest.approx(10000.0)
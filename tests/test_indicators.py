@@ -0,0 +1,85 @@
+import numpy as np
+import numpy.testing as npt
+import pandas as pd
+import pytest
+
+from app.services._indicators_njit import last_indicators, last_ema, last_rsi, last_atr, scan_stats
+from app.services.quant_engine import QuantEngine
+
+
+def make_series(n=300):
+	rng = np.random.default_rng(42)
+	close = 1.1 + np.cumsum(rng.normal(0, 0.0005, n))
+	high = close + np.abs(rng.normal(0, 0.0003, n))
+	low = close - np.abs(rng.normal(0, 0.0003, n))
+	return close, high, low
+
+
+def test_last_indicators_match_engine():
+	close, high, low = make_series()
+	engine = QuantEngine()
+	rsi, ema_20, ema_50, atr = last_indicators(close, high, low)
+
+	assert rsi == pytest.approx(engine.calculate_rsi(close, 14)[-1], abs=1e-8)
+	assert ema_20 == pytest.approx(engine.calculate_ema(close, 20)[-1], abs=1e-10)
+	assert ema_50 == pytest.approx(engine.calculate_ema(close, 50)[-1], abs=1e-10)
+	assert atr == pytest.approx(engine.calculate_atr(high, low, close, 14)[-1], abs=1e-10)
+
+
+def test_last_indicators_short_history():
+	close, high, low = make_series()
+	rsi, _, _, atr = last_indicators(close[:10], high[:10], low[:10])
+	assert np.isnan(rsi)
+	assert np.isnan(atr)
+
+
+def test_scalar_helpers_match_fused_kernel():
+	close, high, low = make_series()
+	rsi, ema_20, _, atr = last_indicators(close, high, low)
+
+	assert last_rsi(close, 14) == pytest.approx(rsi, abs=1e-10)
+	assert last_ema(close, 20) == pytest.approx(ema_20, abs=1e-10)
+	assert last_atr(high, low, close, 14) == pytest.approx(atr, abs=1e-10)
+
+
+def test_last_ema_adjusted_matches_pandas():
+	close, _, _ = make_series()
+	expected = pd.Series(close).ewm(span=20).mean().iloc[-1]
+	assert last_ema(close, 20, True) == pytest.approx(expected, abs=1e-10)
+
+
+def test_scan_stats_match_numpy():
+	close, high, low = make_series()
+	bar_range, volatility = scan_stats(high, low, close)
+
+	assert bar_range == pytest.approx(high[-14:].max() - low[-14:].min(), abs=1e-12)
+	returns = np.diff(close) / close[:-1]
+	assert volatility == pytest.approx(np.std(returns, ddof=1) * 100, abs=1e-10)
+
+
+def test_multi_period_ema_matches_single_emas():
+	close, _, _ = make_series()
+	engine = QuantEngine()
+	periods = (12, 20, 26, 50, 200)
+	emas = engine.calculate_emas(close, periods)
+
+	assert emas.shape == (len(periods), len(close))
+	for row, period in zip(emas, periods):
+		npt.assert_allclose(row, engine.calculate_ema(close, period), rtol=1e-12)
+
+
+def test_streaming_state_tracks_batch_indicators():
+	close, high, low = make_series()
+	engine = QuantEngine()
+	df = pd.DataFrame({
+		'open': np.r_[close[0], close[:-1]], 'high': high, 'low': low, 'close': close, 'volume': np.ones(len(close)),
+	})
+	engine.generate_signal_streaming('EURUSD', df.iloc[200].to_dict(), history=df.iloc[:200])
+	state = engine.cache['EURUSD']
+	for i in range(201, len(df)):
+		state.update(df.iloc[i].to_dict())
+
+	streamed, batch = state.bundle(), engine._build_bundle(df)
+	for field in ('ema_20', 'ema_50', 'ema_200', 'macd_hist', 'atr', 'bb_upper', 'bb_lower', 'bb_width', 'vwap'):
+		npt.assert_allclose(getattr(streamed, field)[-1], getattr(batch, field)[-1], rtol=1e-7)
+	assert streamed.rsi == pytest.approx(batch.rsi, abs=1e-6)
@@ -0,0 +1,35 @@
+import math
+
+from app.services.settings_store import coerce_settings
+
+
+def test_settings_are_coerced_to_their_default_types():
+	accepted, rejected = coerce_settings({
+		'scan_interval': '15', 'ml_threshold': 70.0, 'risk_per_trade': '0.5',
+		'paper_mode': 'yes', 'telegram_chat_id': -100123, 'unknown': 1})
+	assert accepted == {
+		'scan_interval': 15, 'ml_threshold': 70, 'risk_per_trade': 0.5,
+		'paper_mode': True, 'telegram_chat_id': '-100123'}
+	assert type(accepted['ml_threshold']) is int
+	assert rejected == []
+
+
+def test_invalid_settings_are_rejected_not_truncated():
+	accepted, rejected = coerce_settings({
+		'scan_interval': 0.4, 'quant_confidence': '2.9', 'risk_per_trade': math.inf,
+		'max_drawdown': 'nan', 'news_buffer': True, 'telegram_bot_token': {'a': 1},
+		'telegram_chat_id': None})
+	assert accepted == {}
+	assert sorted(rejected) == sorted([
+		'scan_interval', 'quant_confidence', 'risk_per_trade', 'max_drawdown',
+		'news_buffer', 'telegram_bot_token', 'telegram_chat_id'])
+
+
+def test_bool_settings_accept_only_explicit_values():
+	for value, expected in [(True, True), (0, False), (1.0, True), (' On ', True), ('no', False), ('0', False)]:
+		accepted, rejected = coerce_settings({'paper_mode': value})
+		assert accepted == {'paper_mode': expected} and rejected == []
+
+	for value in ['garbage', 'flase', '', 2, -1, 0.5, {}, [1], None]:
+		accepted, rejected = coerce_settings({'paper_mode': value})
+		assert accepted == {} and rejected == ['paper_mode'], value